@@ -7,10 +7,18 @@ happens via CLI + git PR review.
 Endpoints:
   GET /                  static index.html with tabs
   GET /api/health        liveness probe
-  GET /api/kg-data       all 6 KGs merged into Cytoscape elements (nodes + edges)
+  GET /api/kg-data       all 6 KGs merged into Cytoscape elements (nodes + edges),
+                         with server-side layout positions when NumPy is installed;
+                         cached per input-file state, ETag / If-None-Match -> 304
+  GET /api/kg-data/diff?since=<rev>  nodes/edges added, removed, changed since rev
+  GET /api/kg-subgraph?root=<id>&depth=<n>&edge_labels=<a,b>  bounded neighbourhood
+  GET /api/kg-clusters?by=<source|category|parent>&expand=<id>...  collapsed view
   GET /api/kg-stats      counts per role/track
   GET /api/proposals     list of pending proposals (parsed JSON + matched UPDATE_LOG)
   GET /api/timeline      reverse-chrono list of UPDATE_LOG_*.md headers
+  GET /api/kg-autocomplete?q=<prefix>  typo-tolerant id/title completions
+  GET /api/events        Server-Sent Events: graph / proposal / timeline
+                         change notifications from one shared file watcher
 
 Run:
     pip install fastapi uvicorn
@@ -19,16 +27,29 @@ Run:
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
 import re
+import secrets
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import Any, AsyncIterator, Callable, Literal
 
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 
 from agentloom import REPO_ROOT as WORKSPACE
+from agentloom.dashboard.clusters import Clustering
+from agentloom.dashboard.layout import LayoutCache, Position
+from agentloom.kg.kg_centrality import node_edges
+from agentloom.kg.kg_index import CACHE_DIR, get_index
+from agentloom.kg.kg_watch import Watcher
+from agentloom.kg.proposal_index import ProposalIndex, proposal_slug
 KG_DIR = WORKSPACE / "agents" / "knowledge-graphs"
 PROPOSALS_DIR = KG_DIR / "proposals"
 STATIC_DIR = Path(__file__).resolve().parent / "static"
@@ -44,6 +65,14 @@ KG_FILES = {
 
 MASTER_FILE = KG_DIR / "master-graph.json"
 
+# A file modified this recently may change again within the same mtime tick;
+# its stat is not trusted as a cache key (the git racy-timestamp rule).
+_RACY_WINDOW_NS = 2_000_000_000
+
+# Shared, incrementally maintained view of the proposals folder: requests
+# cost a stat() of the folder unless something was added or removed.
+_proposal_index = ProposalIndex(PROPOSALS_DIR)
+
 app = FastAPI(title="AgentLoom KG Dashboard", version="0.1.0")
 
 
@@ -86,30 +115,11 @@ def _normalize_node(node: dict, source: str) -> dict:
 def _collect_edges(node: dict, all_ids: set[str]) -> list[dict]:
     """Pull parent/child + links.* edges for one node, dropping refs to
     nodes that aren't in the corpus."""
-    nid = node.get("id")
-    edges = []
-
-    # nested relationships shape
-    rel = node.get("relationships") or {}
-    parent = rel.get("parent")
-    if parent and parent in all_ids:
-        edges.append({"source": parent, "target": nid, "label": "child"})
-
-    # flat shape — parent at top-level
-    flat_parent = node.get("parent")
-    if flat_parent and flat_parent in all_ids:
-        edges.append({"source": flat_parent, "target": nid, "label": "child"})
-
-    # links: {label: [target_ids]}
-    links = node.get("links") or {}
-    for label, val in links.items():
-        if isinstance(val, list):
-            for tgt in val:
-                if isinstance(tgt, str) and tgt in all_ids:
-                    edges.append({"source": nid, "target": tgt, "label": label})
-        elif isinstance(val, str) and val in all_ids:
-            edges.append({"source": nid, "target": val, "label": label})
-    return edges
+    return [
+        {"source": src, "target": tgt, "label": label}
+        for src, tgt, label in node_edges(node)
+        if src in all_ids and tgt in all_ids
+    ]
 
 
 def _load_master() -> dict | None:
@@ -153,8 +163,333 @@ def _master_edges(master: dict, all_ids: set[str]) -> list[dict]:
     return out
 
 
+def _kg_inputs() -> list[Path]:
+    """Every file /api/kg-data is assembled from."""
+    return [path for path, _ in KG_FILES.values()] + [MASTER_FILE]
+
+
+def _stat_key(paths: list[Path]) -> tuple | None:
+    """(mtime_ns, size) per input, or None if any input is too fresh to trust."""
+    now = time.time_ns()
+    key: list[tuple[int, int] | None] = []
+    for path in paths:
+        try:
+            st = path.stat()
+        except OSError:
+            key.append(None)
+            continue
+        if now - st.st_mtime_ns < _RACY_WINDOW_NS:
+            return None
+        key.append((st.st_mtime_ns, st.st_size))
+    return tuple(key)
+
+
+def _content_digest(paths: list[Path]) -> str:
+    digest = hashlib.sha1()
+    for path in paths:
+        try:
+            data = path.read_bytes()
+        except OSError:
+            data = b""
+        digest.update(len(data).to_bytes(8, "big"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+# One revision of /api/kg-data: node id -> node, (source, target, label) -> edge.
+_Elements = tuple[dict[str, dict], dict[tuple[str, str, str], dict]]
+
+
+def _edge_key(edge: dict) -> tuple[str, str, str]:
+    return (edge["source"], edge["target"], edge["label"])
+
+
+def _elements(data: dict, previous: _Elements | None) -> _Elements:
+    """Index ``data`` by node id / edge key, reusing ``previous``'s equal objects.
+
+    Sharing unchanged element dicts keeps old revisions cheap to hold and
+    makes comparing two revisions mostly identity checks.
+    """
+    old_nodes, old_edges = previous or ({}, {})
+    nodes: dict[str, dict] = {}
+    for node in data["nodes"]:
+        old = old_nodes.get(node["id"])
+        nodes[node["id"]] = old if old == node else node
+    edges: dict[tuple[str, str, str], dict] = {}
+    for edge in data["edges"]:
+        key = _edge_key(edge)
+        edges[key] = old_edges.get(key, edge)
+    return nodes, edges
+
+
+def _layout(layout: LayoutCache, elements: _Elements) -> dict[str, Position] | None:
+    """Node positions from ``layout`` (see ``agentloom.dashboard.layout``), or
+    None without NumPy, in which case the browser lays the graph out itself."""
+    nodes, edges = elements
+    try:
+        positions = layout.update(list(nodes), [(e["source"], e["target"]) for e in edges.values()])
+    except ImportError:
+        return None
+    return {nid: positions[nid] for nid in nodes}
+
+
+def _serialize(payload: dict) -> tuple[bytes, str]:
+    """(compact UTF-8 JSON body, strong ETag) for ``payload``."""
+    body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return body, f'"{hashlib.sha1(body).hexdigest()}"'
+
+
+def _diff_elements(old: _Elements, new: _Elements) -> dict:
+    """Added/removed/changed nodes and added/removed edges from ``old`` to ``new``.
+
+    Edges are identified by all of their fields, so an edge never "changes":
+    it is removed and another one added.
+    """
+    old_nodes, old_edges = old
+    new_nodes, new_edges = new
+    return {
+        "nodes": {
+            "added": [n for nid, n in new_nodes.items() if nid not in old_nodes],
+            "removed": [nid for nid in old_nodes if nid not in new_nodes],
+            "changed": [
+                n for nid, n in new_nodes.items()
+                if nid in old_nodes and old_nodes[nid] is not n and old_nodes[nid] != n
+            ],
+        },
+        "edges": {
+            "added": [e for key, e in new_edges.items() if key not in old_edges],
+            "removed": [e for key, e in old_edges.items() if key not in new_edges],
+        },
+    }
+
+
+@dataclass
+class _KGDataCache:
+    """The serialized /api/kg-data response, rebuilt only when an input changes.
+
+    A request costs one stat() per input file. When a stat moved, the inputs
+    are re-hashed and the payload is rebuilt only if their content changed
+    (so a ``touch`` or a checkout of identical content keeps the same ETag).
+
+    Every rebuild whose elements differ from the last one gets the next
+    revision number. Clients see it as the token ``<epoch>-<number>`` (the
+    payload's ``revision``), where ``epoch`` is random per process, so a
+    token from before a restart never names a revision of this one. The
+    elements of the last ``history`` revisions are kept so ``diff(since)``
+    can say what changed since a revision a client already has, and
+    ``derived`` caches indexes computed from the current revision's elements.
+
+    With ``layout`` set, each new revision also gets server-side node
+    ``positions`` (in the payload, and for added nodes in diffs). The layout
+    runs outside ``lock``: until it is done, other requests are served the
+    new revision without positions (the browser lays those out itself).
+    """
+
+    layout: LayoutCache | None = None
+    history: int = 8
+    epoch: str = field(default_factory=lambda: secrets.token_hex(4))
+    # (stat key, content digest, JSON body, strong ETag, revision), swapped as one tuple
+    current: tuple[tuple | None, str, bytes, str, int] = (None, "", b"", "", 0)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    # revision -> its elements, oldest first
+    _revisions: dict[int, _Elements] = field(default_factory=dict)
+    # since -> serialized diff to the current revision
+    _diffs: dict[int, bytes] = field(default_factory=dict)
+    # (revision, node id -> position) for the last revision laid out here
+    _positions: tuple[int, dict[str, Position]] | None = None
+    # (revision, data, elements) of a revision published without positions yet;
+    # the next get() (or place_later()) lays it out
+    _unplaced: tuple[int, dict, _Elements] | None = None
+    # Serializes layouts (LayoutCache is not thread-safe); never taken under lock
+    _layout_lock: threading.Lock = field(default_factory=threading.Lock)
+    # name -> (revision token, value) for derived()
+    _derived: dict[str, tuple[str, Any]] = field(default_factory=dict)
+    _derive_lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def get(self) -> tuple[bytes, str]:
+        body, etag = self.refresh()
+        if self._unplaced is not None:
+            self._place()
+            body, etag = self.current[2], self.current[3]
+        return body, etag
+
+    def refresh(self) -> tuple[bytes, str]:
+        """(body, etag) for the inputs as they are now, without waiting for a
+        layout; a new revision that needs one is queued for the next get()."""
+        paths = _kg_inputs()
+        key = _stat_key(paths)
+        cached_key, digest, body, etag, revision = self.current
+        if key is not None and key == cached_key:
+            return body, etag
+        with self.lock:
+            cached_key, digest, body, etag, revision = self.current
+            if key is not None and key == cached_key:
+                return body, etag
+            new_digest = _content_digest(paths)
+            if new_digest != digest or not body:
+                data = _build_kg_data()
+                latest = self._revisions.get(revision)
+                elements = _elements(data, latest)
+                if latest is None or elements != latest:
+                    revision += 1
+                    self._revisions[revision] = elements
+                    while len(self._revisions) > self.history:
+                        del self._revisions[next(iter(self._revisions))]
+                    self._diffs.clear()
+                    body, etag = _serialize({"revision": self.token(revision), **data})
+                    if self.layout is not None:
+                        self._unplaced = (revision, data, elements)
+            self.current = (key, new_digest, body, etag, revision)
+            return body, etag
+
+    def place_later(self) -> None:
+        """Lay out a queued revision on a worker thread (see ``get``)."""
+        if self._unplaced is not None:
+            threading.Thread(target=self.get, name="kg-layout", daemon=True).start()
+
+    def _place(self) -> None:
+        """Lay out the queued revision and republish its body with ``positions``.
+
+        Returns at once if another thread is laying out; that one picks up
+        whatever was queued meanwhile before it stops.
+        """
+        while self._unplaced is not None and self._layout_lock.acquire(blocking=False):
+            try:
+                with self.lock:
+                    pending, self._unplaced = self._unplaced, None
+                if pending is None:
+                    continue
+                revision, data, elements = pending
+                positions = _layout(self.layout, elements)
+                with self.lock:
+                    key, digest, body, etag, current = self.current
+                    if positions is None or current != revision:
+                        # No NumPy, or superseded by a newer revision.
+                        continue
+                    self._positions = (revision, positions)
+                    self._diffs.clear()
+                    body, etag = _serialize(
+                        {"revision": self.token(revision), **data, "positions": positions}
+                    )
+                    self.current = (key, digest, body, etag, revision)
+            finally:
+                self._layout_lock.release()
+
+    def positions(self, token: str) -> dict[str, Position] | None:
+        """Node positions of revision ``token``, if it has been laid out here."""
+        laid_out = self._positions
+        if laid_out is None or self.token(laid_out[0]) != token:
+            return None
+        return laid_out[1]
+
+    def token(self, revision: int) -> str:
+        """The client-facing token for ``revision``."""
+        return f"{self.epoch}-{revision}"
+
+    def diff(self, since: str) -> bytes | None:
+        """Serialized changes from revision token ``since`` to the current one.
+
+        None when ``since`` is not (or no longer) held, or comes from another
+        process; the client should then refetch the whole payload.
+        """
+        epoch, _, number = since.rpartition("-")
+        if epoch != self.epoch or not number.isdigit():
+            return None
+        self.get()
+        with self.lock:
+            revision = self.current[4]
+            cached = self._diffs.get(int(number))
+            if cached is not None:
+                return cached
+            old = self._revisions.get(int(number))
+            if old is None:
+                return None
+            payload = {
+                "since": since, "revision": self.token(revision),
+                **_diff_elements(old, self._revisions[revision]),
+            }
+            if self._positions is not None and self._positions[0] == revision:
+                positions = self._positions[1]
+                payload["positions"] = {
+                    n["id"]: positions[n["id"]] for n in payload["nodes"]["added"]
+                }
+            body, _ = _serialize(payload)
+            self._diffs[int(number)] = body
+            return body
+
+    def derived(self, name: str, build: Callable[[_Elements], Any]) -> tuple[str, Any]:
+        """(revision token, ``build(elements)``) for the current revision.
+
+        ``build`` runs once per revision and name; concurrent callers wait
+        for that one build instead of repeating it. Does not wait for the
+        revision's layout.
+        """
+        self.refresh()
+        with self._derive_lock:
+            with self.lock:
+                revision = self.current[4]
+                elements = self._revisions[revision]
+                hit = self._derived.get(name)
+            if hit is not None and hit[0] == self.token(revision):
+                return hit
+            value = (self.token(revision), build(elements))
+            with self.lock:
+                self._derived[name] = value
+            return value
+
+
+_kg_data_cache = _KGDataCache(layout=LayoutCache(CACHE_DIR / "kg-layout.json"))
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """RFC 9110 If-None-Match check (weak comparison, as the spec requires)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(",")
+    )
+
+
 @app.get("/api/kg-data")
-def kg_data() -> dict:
+def kg_data(request: Request) -> Response:
+    """Cytoscape-format elements: {revision, nodes: [...], edges: [...]}, plus
+    ``positions`` ({node id: [x, y]}) when the layout is computed server-side.
+
+    Served from ``_kg_data_cache`` with a strong ETag; a request whose
+    ``If-None-Match`` matches gets an empty 304.
+    """
+    body, etag = _kg_data_cache.get()
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@app.get("/api/kg-data/diff")
+def kg_data_diff(since: str) -> Response:
+    """What changed in /api/kg-data since revision ``since``.
+
+    ``{since, revision, nodes: {added, removed, changed}, edges: {added,
+    removed}}``: added/changed hold full elements, removed nodes are ids and
+    removed edges their ``{source, target, label}``; ``positions`` of the
+    added nodes come along when laid out server-side (other nodes keep
+    theirs). 410 when ``since`` is too old to diff against, or from before
+    a server restart (refetch /api/kg-data instead).
+    """
+    body = _kg_data_cache.diff(since)
+    if body is None:
+        raise HTTPException(
+            status_code=410,
+            detail=f"revision {since} is not cached; refetch /api/kg-data",
+        )
+    return Response(
+        content=body, media_type="application/json", headers={"Cache-Control": "no-cache"}
+    )
+
+
+def _build_kg_data() -> dict:
     """Cytoscape-format elements: {nodes: [...], edges: [...]}.
 
     Includes a synthetic master-root node + edges to each role's KG roots,
@@ -197,6 +532,107 @@ def kg_data() -> dict:
     return {"nodes": nodes, "edges": deduped}
 
 
+# node id -> [(neighbour id, edge)] over its edges in either direction
+_Adjacency = dict[str, list[tuple[str, dict]]]
+
+
+def _adjacency(elements: _Elements) -> tuple[dict[str, dict], _Adjacency]:
+    nodes, edges = elements
+    adjacency: _Adjacency = {nid: [] for nid in nodes}
+    for edge in edges.values():
+        adjacency[edge["source"]].append((edge["target"], edge))
+        if edge["target"] != edge["source"]:
+            adjacency[edge["target"]].append((edge["source"], edge))
+    return nodes, adjacency
+
+
+def _subgraph(
+    adjacency: _Adjacency,
+    root: str,
+    depth: int,
+    labels: set[str] | None,
+    max_nodes: int,
+) -> tuple[dict[str, int], bool]:
+    """Breadth-first neighbourhood of ``root``: (node id -> hop count, truncated).
+
+    Follows edges in both directions, only those labelled in ``labels``
+    (all when None), and stops once ``max_nodes`` nodes are taken; nearer
+    nodes always win over farther ones.
+    """
+    hops = {root: 0}
+    frontier = [root]
+    for level in range(1, depth + 1):
+        nxt = []
+        for nid in frontier:
+            for other, edge in adjacency[nid]:
+                if other in hops or (labels is not None and edge["label"] not in labels):
+                    continue
+                if len(hops) >= max_nodes:
+                    return hops, True
+                hops[other] = level
+                nxt.append(other)
+        if not nxt:
+            break
+        frontier = nxt
+    return hops, False
+
+
+@app.get("/api/kg-subgraph")
+def kg_subgraph(root: str, depth: int = 1, edge_labels: str = "", max_nodes: int = 300) -> dict:
+    """Nodes within ``depth`` hops of ``root``, plus the edges between them.
+
+    ``edge_labels`` is a comma-separated allow-list of edge labels to follow
+    and return (default: all). At most ``max_nodes`` nodes are returned,
+    nearest first; ``truncated`` says whether the budget cut the result.
+    Served from an adjacency index built once per /api/kg-data revision.
+    """
+    revision, (nodes, adjacency) = _kg_data_cache.derived("adjacency", _adjacency)
+    if root not in adjacency:
+        raise HTTPException(status_code=404, detail=f"unknown node: {root}")
+    labels = {label.strip() for label in edge_labels.split(",") if label.strip()} or None
+    hops, truncated = _subgraph(
+        adjacency, root, max(0, min(depth, 10)), labels, max(1, min(max_nodes, 5000))
+    )
+    edges = [
+        edge
+        for nid in hops
+        for other, edge in adjacency[nid]
+        if other in hops and edge["source"] == nid
+        and (labels is None or edge["label"] in labels)
+    ]
+    return {
+        "revision": revision,
+        "root": root,
+        "nodes": [{**nodes[nid], "hops": n} for nid, n in hops.items()],
+        "edges": edges,
+        "truncated": truncated,
+    }
+
+
+@app.get("/api/kg-clusters")
+def kg_clusters(
+    by: Literal["source", "category", "parent"] = "source",
+    expand: list[str] = Query(default=[]),
+) -> dict:
+    """The graph collapsed into clusters, with the ``expand`` ones opened.
+
+    ``{revision, by, nodes, edges, expanded}``: ``nodes`` mixes real nodes
+    and cluster super-nodes (``type: "cluster"``, with ``count`` and
+    ``parent``); ``edges`` are merged per endpoint pair and label, with a
+    ``count``. Repeat ``expand`` to open several clusters. The hierarchy
+    (``agentloom.dashboard.clusters``) is built once per kg-data revision.
+    Once the revision is laid out server-side, ``positions`` places every
+    shown node (clusters at their members' centroid).
+    """
+    # Large graphs are only ever viewed through here, so lay them out here.
+    _kg_data_cache.get()
+    revision, clustering = _kg_data_cache.derived(
+        f"clusters:{by}", lambda elements: Clustering.build(*elements, by)
+    )
+    view = clustering.view(expand, _kg_data_cache.positions(revision))
+    return {"revision": revision, "by": by, **view}
+
+
 @app.get("/api/kg-stats")
 def kg_stats() -> dict:
     out: dict[str, Any] = {"per_graph": {}, "totals": {}}
@@ -210,42 +646,27 @@ def kg_stats() -> dict:
         out["per_graph"][source] = n
         total += n
     out["totals"]["nodes"] = total
-    out["totals"]["pending_proposals"] = len(list(PROPOSALS_DIR.glob("*.json"))) \
-        if PROPOSALS_DIR.exists() else 0
+    _proposal_index.refresh()
+    out["totals"]["pending_proposals"] = len(_proposal_index.entries())
     return out
 
 
 @app.get("/api/proposals")
 def proposals() -> list[dict]:
-    if not PROPOSALS_DIR.exists():
-        return []
+    _proposal_index.refresh()
     out = []
-    json_files = sorted(PROPOSALS_DIR.glob("*.json"))
-    log_files = {p.name: p for p in PROPOSALS_DIR.glob("UPDATE_LOG_*.md")}
-
-    for jf in json_files:
-        try:
-            payload = json.loads(jf.read_text(encoding="utf-8"))
-        except Exception as exc:
-            payload = {"_error": f"failed to parse: {exc}"}
-
-        slug_match = re.match(r"^\d{8}-\d{6}-(.+)\.json$", jf.name)
-        slug = slug_match.group(1) if slug_match else jf.stem
-        log_name = next(
-            (n for n in log_files
-             if n.startswith("UPDATE_LOG_") and n.endswith(f"_proposal_{slug}.md")),
-            None,
-        )
-        log_text = log_files[log_name].read_text(encoding="utf-8") if log_name else ""
-
+    for entry in _proposal_index.entries():
+        payload = entry.payload if entry.error is None \
+            else {"_error": f"failed to parse: {entry.error}"}
+        log_name = _proposal_index.log_for(entry.slug)
         out.append({
-            "filename": jf.name,
-            "slug": slug,
+            "filename": entry.filename,
+            "slug": entry.slug,
             "node_id": payload.get("id"),
             "node_type": payload.get("type"),
             "node": payload,
             "update_log_filename": log_name,
-            "update_log_text": log_text,
+            "update_log_text": _proposal_index.log_text(log_name) if log_name else "",
         })
     return out
 
@@ -253,19 +674,18 @@ def proposals() -> list[dict]:
 @app.get("/api/timeline")
 def timeline() -> list[dict]:
     """Reverse-chronological list of UPDATE_LOG_*.md across the repo."""
-    if not PROPOSALS_DIR.exists():
-        return []
+    _proposal_index.refresh()
     entries = []
-    for md in PROPOSALS_DIR.glob("UPDATE_LOG_*.md"):
-        text = md.read_text(encoding="utf-8")
-        first_line = text.splitlines()[0] if text else md.name
+    for name in _proposal_index.log_names():
+        text = _proposal_index.log_text(name)
+        first_line = text.splitlines()[0] if text else name
         title = first_line.lstrip("# ").strip()
-        m = re.match(r"^UPDATE_LOG_(\d{8})_(\w+)_(.+)\.md$", md.name)
+        m = re.match(r"^UPDATE_LOG_(\d{8})_(\w+)_(.+)\.md$", name)
         date_str = m.group(1) if m else ""
         kind = m.group(2) if m else ""
-        slug = m.group(3) if m else md.stem
+        slug = m.group(3) if m else Path(name).stem
         entries.append({
-            "filename": md.name,
+            "filename": name,
             "date": f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:8]}" if date_str else "",
             "kind": kind,
             "slug": slug,
@@ -275,6 +695,214 @@ def timeline() -> list[dict]:
     return entries
 
 
+@app.get("/api/kg-autocomplete")
+def kg_autocomplete(q: str = "", limit: int = 10) -> list[dict]:
+    """Search-box completions: nodes whose id or id/title words start with q."""
+    return get_index().autocomplete(q, limit=max(1, min(limit, 50)))
+
+
+# Seconds between SSE comment lines that keep idle connections (and proxies) open.
+_KEEPALIVE_S = 15.0
+
+
+def _sse(event_id: int, name: str, data: dict) -> str:
+    return f"id: {event_id}\nevent: {name}\ndata: {json.dumps(data)}\n\n"
+
+
+def _proposal_names() -> set[str]:
+    """Names of the proposal JSON files in PROPOSALS_DIR (none if it is missing)."""
+    try:
+        return {p.name for p in PROPOSALS_DIR.iterdir() if p.suffix == ".json"}
+    except OSError:
+        return set()
+
+
+@dataclass
+class _EventHub:
+    """Fans one shared ``Watcher`` out to every /api/events client.
+
+    The watcher (started by the first client) covers the graph files and the
+    proposals folder. Each batch of changed paths becomes a few small events,
+    classified from file names (and, when the proposals folder itself
+    changed, from its listing):
+
+    * ``graph``    ``{"source"}`` — a graph (or the master graph) changed;
+    * ``proposal`` ``{"action": "added"|"changed"|"removed", "filename", "slug"}``;
+    * ``timeline`` ``{"filename"}`` — an UPDATE_LOG_*.md appeared or changed.
+
+    Before notifying, the hub refreshes the shared kg-data cache and proposal
+    index once, so however many clients refetch, each file is parsed once;
+    a new graph revision is laid out afterwards, on a worker thread.
+    The last ``history`` events are kept for clients resuming with
+    ``Last-Event-ID``; one too far behind (or from before a restart) gets a
+    ``resync`` event, meaning "refetch everything".
+    """
+
+    watcher: Watcher = field(default_factory=Watcher)
+    history: int = 256
+    _events: deque[tuple[int, str, dict]] = field(default_factory=deque, init=False)
+    _last_id: int = field(default=0, init=False)
+    # client queue -> the event loop its stream runs on
+    _clients: dict[asyncio.Queue, asyncio.AbstractEventLoop] = field(
+        default_factory=dict, init=False
+    )
+    _proposals: set[str] = field(default_factory=set, init=False)
+    _started: bool = field(default=False, init=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def start(self) -> None:
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+            self._proposals = _proposal_names()
+        self.watcher.watch("dashboard", files=_kg_inputs(), dirs=[PROPOSALS_DIR])
+        self.watcher.subscribe(self._on_change)
+        self.watcher.start()
+
+    def stop(self) -> None:
+        self.watcher.stop()
+
+    # -- watcher side (watcher thread) --------------------------------------------
+
+    def _classify(self, paths: set[Path]) -> list[tuple[str, dict]]:
+        sources = {path: source for source, (path, _) in KG_FILES.items()}
+        sources[MASTER_FILE] = "master"
+        events: list[tuple[str, dict]] = []
+        # Proposals already reported by a rescan of the folder in this batch.
+        rescanned: set[str] = set()
+        for path in sorted(paths):
+            if path in sources:
+                events.append(("graph", {"source": sources[path]}))
+            elif path == PROPOSALS_DIR:
+                # The folder itself changed: it may have just been created (or
+                # removed) with proposals in it, so diff its whole listing.
+                current = _proposal_names()
+                for name in sorted(current ^ self._proposals):
+                    action = "added" if name in current else "removed"
+                    events.append(("proposal", {
+                        "action": action,
+                        "filename": name,
+                        "slug": proposal_slug(name),
+                    }))
+                rescanned |= current ^ self._proposals
+                self._proposals = current
+            elif path.parent != PROPOSALS_DIR or path.name in rescanned:
+                continue
+            elif path.suffix == ".json":
+                if not path.exists():
+                    if path.name not in self._proposals:
+                        continue
+                    self._proposals.discard(path.name)
+                    action = "removed"
+                elif path.name in self._proposals:
+                    action = "changed"
+                else:
+                    self._proposals.add(path.name)
+                    action = "added"
+                events.append(("proposal", {
+                    "action": action,
+                    "filename": path.name,
+                    "slug": proposal_slug(path.name),
+                }))
+            elif path.name.startswith("UPDATE_LOG_") and path.suffix == ".md":
+                events.append(("timeline", {"filename": path.name}))
+        return events
+
+    def _on_change(self, paths: set[Path]) -> None:
+        events = self._classify(paths)
+        if not events:
+            return
+        names = {name for name, _ in events} if self._clients else set()
+        if "graph" in names:
+            # The new revision is built here; its layout runs after publishing,
+            # on a worker thread, so no event waits for it.
+            _kg_data_cache.refresh()
+        if names & {"proposal", "timeline"}:
+            # full=True also catches proposals rewritten in place.
+            _proposal_index.refresh(full=True)
+        self.publish(events)
+        if "graph" in names:
+            _kg_data_cache.place_later()
+
+    def publish(self, events: list[tuple[str, dict]]) -> None:
+        with self._lock:
+            batch = []
+            for name, data in events:
+                self._last_id += 1
+                batch.append((self._last_id, name, data))
+            self._events.extend(batch)
+            while len(self._events) > self.history:
+                self._events.popleft()
+            clients = list(self._clients.items())
+        for queue, loop in clients:
+            for event in batch:
+                try:
+                    loop.call_soon_threadsafe(self._offer, queue, event)
+                except RuntimeError:  # the client's loop is gone
+                    with self._lock:
+                        self._clients.pop(queue, None)
+                    break
+
+    def _offer(self, queue: asyncio.Queue, event: tuple[int, str, dict]) -> None:
+        """Queue ``event`` for one client; a client that stopped reading is resynced."""
+        if queue.full():
+            while not queue.empty():
+                queue.get_nowait()
+            event = (event[0], "resync", {})
+        queue.put_nowait(event)
+
+    # -- client side (event loop) ---------------------------------------------------
+
+    def _backlog(self, last_event_id: str | None) -> list[tuple[int, str, dict]]:
+        """Events a client resuming after ``last_event_id`` missed (caller holds the lock)."""
+        if last_event_id is None:
+            return []
+        try:
+            last = int(last_event_id)
+        except ValueError:
+            last = -1
+        oldest = self._events[0][0] if self._events else self._last_id + 1
+        if 0 <= last <= self._last_id and last >= oldest - 1:
+            return [e for e in self._events if e[0] > last]
+        return [(self._last_id, "resync", {})]
+
+    async def stream(self, last_event_id: str | None = None) -> AsyncIterator[str]:
+        """SSE text for one client, until it disconnects."""
+        self.start()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.history)
+        with self._lock:
+            self._clients[queue] = asyncio.get_running_loop()
+            backlog = self._backlog(last_event_id)
+        try:
+            yield "retry: 3000\n\n"
+            for event in backlog:
+                yield _sse(*event)
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), _KEEPALIVE_S)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield _sse(*event)
+        finally:
+            with self._lock:
+                self._clients.pop(queue, None)
+
+
+_event_hub = _EventHub()
+
+
+@app.get("/api/events")
+def events(request: Request) -> StreamingResponse:
+    """Server-Sent Events stream of KG / proposal / timeline changes (see ``_EventHub``)."""
+    return StreamingResponse(
+        _event_hub.stream(request.headers.get("last-event-id")),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 # Static files (must be mounted last so /api/* routes win).
 if STATIC_DIR.exists():
     app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
@@ -0,0 +1,187 @@
+"""dashboard/clusters.py — level-of-detail cluster views of the merged KG.
+
+Past a few thousand nodes the dashboard graph is unreadable and slow to
+render, so large graphs are shown collapsed: subtrees become super-nodes
+with a node count, and the edges between them are aggregated. A
+``Clustering`` is the cluster hierarchy for one grouping (built once per
+kg-data revision); ``view(expanded)`` renders it with the given clusters
+opened, so a client expands one cluster at a time by adding its id.
+
+Groupings (``by``):
+
+* ``source``   — one cluster per source graph, holding one per category;
+* ``category`` — one cluster per category, across graphs;
+* ``parent``   — the parent/child tree (plus the master graph's
+  ``contains`` edges): every node with children heads a cluster holding
+  itself and its children's subtrees.
+
+Cluster ids are ``<kind>:<key>`` (``source:domain-skills``,
+``category:domain-skills/tools``, ``parent:<node id>``).
+"""
+from __future__ import annotations
+
+from collections import Counter, deque
+from dataclasses import dataclass
+from typing import Iterable
+
+from agentloom.dashboard.layout import Position
+from agentloom.kg.kg_centrality import CHILD_LABEL
+
+GROUPINGS = ("source", "category", "parent")
+# Edge labels read as "source is the parent of target" for by="parent".
+PARENT_LABELS = frozenset({CHILD_LABEL, "contains"})
+
+
+@dataclass
+class Clustering:
+    by: str
+    nodes: dict[str, dict]
+    # (source, target, label) -> edge
+    edges: dict[tuple[str, str, str], dict]
+    # cluster id -> super-node: {id, label, type, kind, count, parent}
+    clusters: dict[str, dict]
+    # node id -> ids of the clusters enclosing it, outermost first
+    chains: dict[str, tuple[str, ...]]
+
+    @classmethod
+    def build(
+        cls,
+        nodes: dict[str, dict],
+        edges: dict[tuple[str, str, str], dict],
+        by: str,
+    ) -> Clustering:
+        if by == "parent":
+            chains, labels = _parent_chains(nodes, edges)
+        else:
+            chains, labels = _attribute_chains(nodes, by)
+        counts: Counter[str] = Counter()
+        parents: dict[str, str | None] = {}
+        for chain in chains.values():
+            counts.update(chain)
+            for outer, inner in zip((None,) + chain, chain):
+                parents.setdefault(inner, outer)
+        clusters = {
+            cid: {
+                "id": cid,
+                "label": labels[cid],
+                "type": "cluster",
+                "kind": cid.split(":", 1)[0],
+                "count": counts[cid],
+                "parent": parents[cid],
+            }
+            for cid in counts
+        }
+        return cls(by, nodes, edges, clusters, chains)
+
+    def view(
+        self,
+        expanded: Iterable[str] = (),
+        positions: dict[str, Position] | None = None,
+    ) -> dict:
+        """``{"nodes", "edges", "expanded"}`` with ``expanded`` clusters opened.
+
+        Opening a cluster opens its enclosing ones too; unknown ids (say,
+        from an older revision) are ignored and left out of ``expanded``.
+        Every node is shown as itself if all its clusters are open, else as
+        its outermost closed cluster. Edges between the shown items are
+        merged per (source, target, label) with a ``count``; edges inside
+        one closed cluster are dropped.
+
+        Given the full graph's node ``positions`` (``dashboard.layout``), the
+        view also has ``positions`` for what it shows: a node keeps its own,
+        a cluster sits at the centroid of its members.
+        """
+        opened: set[str] = set()
+        for cid in expanded:
+            while cid is not None and cid in self.clusters and cid not in opened:
+                opened.add(cid)
+                cid = self.clusters[cid]["parent"]
+        shown: dict[str, dict] = {}
+        rep: dict[str, str] = {}
+        for nid, chain in self.chains.items():
+            r = next((cid for cid in chain if cid not in opened), None)
+            if r is None:
+                rep[nid] = nid
+                shown.setdefault(nid, self.nodes[nid])
+            else:
+                rep[nid] = r
+                shown.setdefault(r, self.clusters[r])
+        merged: Counter[tuple[str, str, str]] = Counter()
+        for src, tgt, label in self.edges:
+            a, b = rep[src], rep[tgt]
+            if a != b:
+                merged[(a, b, label)] += 1
+        out = {
+            "nodes": list(shown.values()),
+            "edges": [
+                {"source": a, "target": b, "label": label, "count": count}
+                for (a, b, label), count in merged.items()
+            ],
+            "expanded": sorted(opened),
+        }
+        if positions is not None:
+            sums: dict[str, list[float]] = {}
+            for nid, r in rep.items():
+                if nid in positions:
+                    acc = sums.setdefault(r, [0.0, 0.0, 0])
+                    acc[0] += positions[nid][0]
+                    acc[1] += positions[nid][1]
+                    acc[2] += 1
+            out["positions"] = {
+                r: (round(x / n, 1), round(y / n, 1)) for r, (x, y, n) in sums.items()
+            }
+        return out
+
+
+def _attribute_chains(
+    nodes: dict[str, dict], by: str
+) -> tuple[dict[str, tuple[str, ...]], dict[str, str]]:
+    chains: dict[str, tuple[str, ...]] = {}
+    labels: dict[str, str] = {}
+    for nid, node in nodes.items():
+        source, category = node.get("source", ""), node.get("category", "")
+        chain = []
+        if by == "source":
+            chain.append(f"source:{source}")
+            labels[chain[-1]] = source
+            if category:
+                chain.append(f"category:{source}/{category}")
+                labels[chain[-1]] = category
+        elif category:
+            chain.append(f"category:{category}")
+            labels[chain[-1]] = category
+        chains[nid] = tuple(chain)
+    return chains, labels
+
+
+def _parent_chains(
+    nodes: dict[str, dict], edges: dict[tuple[str, str, str], dict]
+) -> tuple[dict[str, tuple[str, ...]], dict[str, str]]:
+    parent: dict[str, str] = {}
+    children: dict[str, list[str]] = {}
+    for src, tgt, label in edges:
+        if label in PARENT_LABELS and src != tgt and tgt not in parent:
+            parent[tgt] = src
+            children.setdefault(src, []).append(tgt)
+    # Clusters enclosing a node's own cluster (its ancestors'), outermost first.
+    above: dict[str, tuple[str, ...]] = {}
+    for start in [nid for nid in nodes if nid not in parent] + list(nodes):
+        # Roots first; a node still unplaced afterwards sits on a parent cycle
+        # and is treated as a root to break it.
+        if start in above:
+            continue
+        above[start] = ()
+        queue = deque([start])
+        while queue:
+            nid = queue.popleft()
+            inner = above[nid] + (f"parent:{nid}",)
+            for child in children.get(nid, ()):
+                if child not in above:
+                    above[child] = inner
+                    queue.append(child)
+    chains = {
+        nid: above[nid] + ((f"parent:{nid}",) if nid in children else ())
+        for nid in nodes
+    }
+    labels = {f"parent:{nid}": nodes[nid].get("label", nid) for nid in children}
+    return chains, labels
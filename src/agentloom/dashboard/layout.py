@@ -0,0 +1,259 @@
+"""dashboard/layout.py — server-side force-directed layout for /api/kg-data.
+
+Browsers running Cytoscape's ``cose`` layout on every page load freeze on
+big graphs, so the dashboard computes node positions once per graph
+revision and ships them with the payload (the client renders them with the
+``preset`` layout).
+
+``force_layout`` is a Fruchterman–Reingold layout in NumPy. Repulsion is
+exact for graphs up to ``EXACT_LIMIT`` nodes; above that, each node is
+repelled by the centroids of a coarse grid of cells (weighted by how many
+nodes they hold) instead of by every other node. Nodes passed in ``fixed``
+keep their positions and only the others move, so a new revision lays out
+just its new nodes and the picture stays stable.
+
+``LayoutCache`` persists the positions on disk, keyed by a digest of the
+graph's topology. A restarted dashboard whose graph is unchanged reuses
+them as-is; otherwise they pin every node that still exists. Deleting the
+cache file forces a fresh layout of the whole graph.
+
+Needs NumPy (``pip install agentloom[layout]``), imported lazily; without it
+``force_layout`` raises ``ImportError`` and the dashboard leaves the layout
+to the browser.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable
+
+Position = tuple[float, float]
+
+_INSTALL_HINT = "Server-side graph layout needs numpy: pip install 'agentloom[layout]'"
+LAYOUT_FORMAT = 1
+# Ideal edge length, in Cytoscape model units (cose's idealEdgeLength).
+SPACING = 90.0
+# Above this many nodes, repulsion is approximated through a grid of cells.
+EXACT_LIMIT = 1500
+# Cap on pairwise distance entries computed at once, to bound memory.
+_CHUNK = 250_000
+
+
+def _require_numpy() -> Any:
+    try:
+        import numpy as np
+    except ImportError as exc:
+        raise ImportError(_INSTALL_HINT) from exc
+    return np
+
+
+def topology_digest(nodes: Iterable[str], edges: Iterable[tuple[str, str]]) -> str:
+    """Digest of a graph's node ids and (source, target) pairs, order-independent."""
+    digest = hashlib.sha1()
+    for nid in sorted(nodes):
+        digest.update(b"n" + nid.encode("utf-8") + b"\0")
+    for src, tgt in sorted(set(edges)):
+        digest.update(b"e" + src.encode("utf-8") + b"\0" + tgt.encode("utf-8") + b"\0")
+    return digest.hexdigest()
+
+
+def _repulsion(np: Any, pos: Any, rows: Any, k: float) -> Any:
+    """Fruchterman–Reingold repulsion (magnitude k²/d) on ``pos[rows]``."""
+    n = len(pos)
+    if n <= EXACT_LIMIT:
+        others, weight, floor = pos, None, 1e-4 * k * k
+    else:
+        side = min(32, int(np.sqrt(n) / 2))
+        lo, hi = pos.min(axis=0), pos.max(axis=0)
+        cell = np.minimum(((pos - lo) / np.maximum(hi - lo, 1e-9) * side).astype(int), side - 1)
+        flat = cell[:, 0] * side + cell[:, 1]
+        weight = np.bincount(flat, minlength=side * side).astype(float)
+        sums = np.zeros((side * side, 2))
+        np.add.at(sums, flat, pos)
+        occupied = weight > 0
+        others = sums[occupied] / weight[occupied, None]
+        weight = weight[occupied]
+        # A node sits inside its own cell; do not let that centroid fling it.
+        floor = 0.25 * k * k
+    out = np.zeros((len(rows), 2))
+    ox, oy = others[:, 0], others[:, 1]
+    step = max(1, _CHUNK // len(others))
+    for start in range(0, len(rows), step):
+        chunk = pos[rows[start:start + step]]
+        dx = chunk[:, 0, None] - ox
+        dy = chunk[:, 1, None] - oy
+        strength = np.maximum(dx * dx + dy * dy, floor)
+        np.divide(k * k, strength, out=strength)
+        if weight is not None:
+            strength *= weight
+        out[start:start + step, 0] = (dx * strength).sum(axis=1)
+        out[start:start + step, 1] = (dy * strength).sum(axis=1)
+    return out
+
+
+def _seed(
+    np: Any,
+    nodes: list[str],
+    neighbours: list[list[int]],
+    pos: Any,
+    placed: Any,
+    rng: Any,
+) -> None:
+    """Start each unplaced node next to its placed neighbours, breadth-first."""
+    order: deque[int] = deque(i for i in range(len(nodes)) if placed[i])
+    if not order:
+        # Nothing to grow from: start at the best-connected node.
+        hub = max(range(len(nodes)), key=lambda i: len(neighbours[i]))
+        placed[hub] = True
+        order.append(hub)
+    centre = pos[placed].mean(axis=0)
+    radius = SPACING * np.sqrt(len(nodes)) / 2
+    while True:
+        while order:
+            i = order.popleft()
+            for j in neighbours[i]:
+                if placed[j]:
+                    continue
+                anchors = [m for m in neighbours[j] if placed[m]]
+                pos[j] = pos[anchors].mean(axis=0) + rng.normal(0, SPACING / 2, 2)
+                placed[j] = True
+                order.append(j)
+        rest = np.flatnonzero(~placed)
+        if not len(rest):
+            return
+        # A node unreachable from anything placed starts somewhere random.
+        angle = rng.uniform(0, 2 * np.pi)
+        pos[rest[0]] = centre + radius * np.array([np.cos(angle), np.sin(angle)])
+        placed[rest[0]] = True
+        order.append(int(rest[0]))
+
+
+def force_layout(
+    nodes: list[str],
+    edges: list[tuple[str, str]],
+    fixed: dict[str, Position] | None = None,
+    iterations: int = 60,
+    seed: int = 0,
+) -> dict[str, Position]:
+    """Positions for ``nodes``; those in ``fixed`` stay where they are.
+
+    ``edges`` are (source, target) pairs; pairs naming unknown nodes are
+    ignored. Deterministic for a given input and ``seed``.
+    """
+    np = _require_numpy()
+    fixed = fixed or {}
+    index = {nid: i for i, nid in enumerate(nodes)}
+    n = len(nodes)
+    if not n:
+        return {}
+    pos = np.zeros((n, 2))
+    pinned = np.zeros(n, dtype=bool)
+    for nid, xy in fixed.items():
+        i = index.get(nid)
+        if i is not None:
+            pos[i] = xy
+            pinned[i] = True
+    free = np.flatnonzero(~pinned)
+    if not len(free):
+        return {nid: (float(x), float(y)) for nid, (x, y) in zip(nodes, pos)}
+
+    pairs = {
+        (index[s], index[t]) for s, t in edges
+        if s in index and t in index and s != t
+    }
+    src = np.fromiter((s for s, _ in pairs), dtype=int, count=len(pairs))
+    dst = np.fromiter((t for _, t in pairs), dtype=int, count=len(pairs))
+    neighbours: list[list[int]] = [[] for _ in range(n)]
+    for s, t in pairs:
+        neighbours[s].append(t)
+        neighbours[t].append(s)
+
+    rng = np.random.default_rng(seed)
+    _seed(np, nodes, neighbours, pos, pinned.copy(), rng)
+
+    k = SPACING
+    moving = np.zeros(n, dtype=bool)
+    moving[free] = True
+    # Only edges touching a moving node exert a force worth computing.
+    live = moving[src] | moving[dst]
+    src, dst = src[live], dst[live]
+    temperature = k * max(1.0, np.sqrt(len(free)) / 2)
+    for step in range(iterations):
+        disp = np.zeros((n, 2))
+        disp[free] = _repulsion(np, pos, free, k)
+        delta = pos[src] - pos[dst]
+        dist = np.sqrt((delta * delta).sum(axis=1))[:, None]
+        pull = delta * dist / k
+        np.add.at(disp, src, -pull)
+        np.add.at(disp, dst, pull)
+        # Mild gravity keeps disconnected pieces from drifting apart.
+        disp[free] -= 0.05 * (pos[free] - pos.mean(axis=0))
+        length = np.sqrt((disp[free] ** 2).sum(axis=1))[:, None]
+        cap = temperature * (1 - step / iterations)
+        pos[free] += disp[free] / np.maximum(length, 1e-9) * np.minimum(length, cap)
+    return {nid: (round(float(x), 1), round(float(y), 1)) for nid, (x, y) in zip(nodes, pos)}
+
+
+@dataclass
+class LayoutCache:
+    """Positions persisted at ``path`` for the topology with digest ``topology``."""
+
+    path: Path | None = None
+    topology: str = ""
+    positions: dict[str, Position] = field(default_factory=dict)
+    _loaded: bool = field(default=False, init=False, repr=False)
+
+    def load(self) -> None:
+        self._loaded = True
+        if self.path is None or not self.path.is_file():
+            return
+        try:
+            payload = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if not isinstance(payload, dict) or payload.get("format") != LAYOUT_FORMAT:
+            return
+        self.topology = payload.get("topology", "")
+        self.positions = {nid: tuple(xy) for nid, xy in payload.get("positions", {}).items()}
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        payload = {
+            "format": LAYOUT_FORMAT,
+            "topology": self.topology,
+            "positions": self.positions,
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(
+                dir=self.path.parent, prefix=self.path.name, suffix=".tmp"
+            )
+        except OSError:
+            # The cache is an optimisation; a read-only checkout just skips it.
+            return
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump(payload, fh, separators=(",", ":"))
+            os.replace(tmp, self.path)
+        except OSError:
+            Path(tmp).unlink(missing_ok=True)
+
+    def update(self, nodes: list[str], edges: list[tuple[str, str]]) -> dict[str, Position]:
+        """Positions for this graph: cached if its topology is unchanged, else
+        laid out with every already-placed node pinned (and saved)."""
+        if not self._loaded:
+            self.load()
+        topology = topology_digest(nodes, edges)
+        if topology == self.topology and set(nodes) <= self.positions.keys():
+            return self.positions
+        fixed = {nid: self.positions[nid] for nid in nodes if nid in self.positions}
+        self.positions = force_layout(nodes, edges, fixed=fixed)
+        self.topology = topology
+        self.save()
+        return self.positions
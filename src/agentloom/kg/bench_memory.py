@@ -0,0 +1,111 @@
+"""Memory benchmark: bytes per ``IndexedNode``, old layout vs the compact one.
+
+Builds synthetic KG nodes shaped like the real graphs (id, type, name,
+category, description, path, parent, links), parses them from JSON the way
+``KGIndex`` does, and measures with ``tracemalloc`` what stays alive once
+the nodes are built:
+
+* ``legacy``  — the previous layout: a regular dataclass holding the raw node
+  dict plus per-node role/track/source strings.
+* ``compact`` — the current slotted ``IndexedNode`` (raw dict dropped,
+  role/track/source as one int code, repeated strings interned).
+
+Only the per-node records are measured; postings and other index tables
+are the same for both layouts.
+
+Usage:
+    python -m agentloom.kg.bench_memory [--nodes 100000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from agentloom.kg.kg_index import SOURCES, IndexedNode, _graph_meta, _node_fields
+
+
+@dataclass
+class _LegacyIndexedNode:
+    """``IndexedNode`` as it was before the compact layout."""
+
+    id: str
+    title: str
+    description: str
+    path: str
+    role: str
+    track: str
+    source: str
+    node: dict
+    body_length: int = 0
+
+
+def _legacy(raw: dict, source: str, pos: int) -> _LegacyIndexedNode:
+    role, track = _graph_meta(source)
+    nid, title, desc, path = _node_fields(raw)
+    return _LegacyIndexedNode(nid, title, desc, path, role, track, source, raw)
+
+
+def synthetic_graph(n: int) -> str:
+    """JSON text of a skills-style graph with ``n`` nodes."""
+    nodes = []
+    for i in range(n):
+        nodes.append({
+            "id": f"skill:domain:node-{i}",
+            "type": "skill",
+            "name": f"Synthetic skill {i}",
+            "category": f"category-{i % 20}",
+            "description": f"Synthetic node {i} for the IndexedNode memory benchmark.",
+            "path": f"agents/skills/domain/skill-node-{i}.md",
+            "parent": f"skill:domain:node-{i // 10}",
+            "links": {"related": [f"skill:domain:node-{(i * 7) % n}"]},
+        })
+    return json.dumps({"skills": nodes})
+
+
+def measure(build: Callable[[dict, str, int], Any], text: str, source: str) -> tuple[int, int]:
+    """(retained bytes, node count) after building one record per raw node."""
+    # Warm-up pass outside the trace: grows interpreter tables (e.g. the
+    # interned-string dict) that would otherwise be charged to the layout.
+    warm = [build(raw, source, pos) for pos, raw in enumerate(json.loads(text)["skills"])]
+    del warm
+    gc.collect()
+    tracemalloc.start()
+    try:
+        raw_nodes = json.loads(text)["skills"]
+        records = [build(raw, source, pos) for pos, raw in enumerate(raw_nodes)]
+        del raw_nodes
+        gc.collect()
+        retained, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    count = len(records)
+    del records
+    return retained, count
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    text = synthetic_graph(args.nodes)
+    source = SOURCES[-2]  # domain-skills
+    results = {
+        "legacy": measure(_legacy, text, source),
+        "compact": measure(IndexedNode.from_raw, text, source),
+    }
+    print(f"{args.nodes} synthetic nodes")
+    for name, (retained, count) in results.items():
+        print(f"  {name:<8} {retained / count:8.0f} bytes/node  ({retained / 2**20:.1f} MiB)")
+    legacy, compact = (results[k][0] for k in ("legacy", "compact"))
+    print(f"  compact uses {compact / legacy:.0%} of legacy")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,55 @@
+"""kg_fuzzy.py — prefix and typo-tolerant term lookup for ``KGIndex``.
+
+Two pieces, both free of per-term memory beyond one sorted array:
+
+* ``PrefixIndex`` — a sorted array of ``(term, payload)`` pairs. A prefix
+  query is two ``bisect`` calls plus a scan of the matching slice, i.e.
+  O(log V + k); on a 100k-term vocabulary that is well under a millisecond.
+  (A sorted array answers the same range queries as a trie or FST here,
+  at a fraction of the Python object overhead.)
+* ``edits1`` — Damerau-Levenshtein neighbourhood (delete, transpose,
+  replace, insert) of a term over the index alphabet ``[a-z0-9]``. Checking
+  the ~70·len(term) candidates against a vocabulary ``dict``/``set`` gives
+  bounded edit distance 1 without building a deletion index.
+"""
+from __future__ import annotations
+
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Generic, Iterable, Iterator, TypeVar
+
+ALPHABET = "abcdefghijklmnopqrstuvwxyz0123456789"
+
+T = TypeVar("T")
+
+
+def edits1(term: str) -> set[str]:
+    """All strings one delete, transpose, replace or insert away from ``term``."""
+    splits = [(term[:i], term[i:]) for i in range(len(term) + 1)]
+    deletes = {a + b[1:] for a, b in splits if b}
+    transposes = {a + b[1] + b[0] + b[2:] for a, b in splits if len(b) > 1}
+    replaces = {a + c + b[1:] for a, b in splits if b for c in ALPHABET if c != b[0]}
+    inserts = {a + c + b for a, b in splits for c in ALPHABET}
+    return (deletes | transposes | replaces | inserts) - {term}
+
+
+@dataclass
+class PrefixIndex(Generic[T]):
+    """Sorted ``(term, payload)`` pairs supporting prefix range scans."""
+
+    _pairs: list[tuple[str, T]] = field(default_factory=list)
+
+    @classmethod
+    def build(cls, pairs: Iterable[tuple[str, T]]) -> PrefixIndex[T]:
+        return cls(sorted(pairs, key=lambda p: p[0]))
+
+    def __len__(self) -> int:
+        return len(self._pairs)
+
+    def scan(self, prefix: str) -> Iterator[tuple[str, T]]:
+        """Pairs whose term starts with ``prefix``, in term order."""
+        i = bisect_left(self._pairs, prefix, key=lambda p: p[0])
+        pairs = self._pairs
+        while i < len(pairs) and pairs[i][0].startswith(prefix):
+            yield pairs[i]
+            i += 1
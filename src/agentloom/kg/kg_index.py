@@ -1,20 +1,73 @@
 """kg_index.py — in-process KG + proposals index for MCP and tooling.
 
-Read-only. Rebuilds when any agents/knowledge-graphs/*.json mtime changes.
-Search uses simple token overlap (no external vector DB).
+Read-only. Rebuilds incrementally: only graph files and markdown bodies whose
+content hash changed are re-read, and only their nodes are re-indexed.
+Search uses simple token overlap (no external vector DB), answered from a
+token -> posting-list inverted index built once per rebuild, so a query only
+touches the postings of its own tokens instead of re-tokenizing the corpus.
+Ranking is pluggable (see ``kg_scoring``): ``mode="overlap"`` (default),
+``mode="bm25f"`` for field-weighted BM25F, or ``mode="tfidf"`` for cosine
+similarity over an optional sparse TF-IDF matrix (``kg_tfidf``, NumPy/SciPy),
+which also backs ``similar(node_id, k)``. ``search(..., boost=w)`` multiplies
+scores by a PageRank prior over the merged parent/``links`` edges
+(``kg_centrality``). ``search_faceted`` also returns hit counts per role,
+track, type, category and status, from per-value doc bitsets.
+``search_page`` (cursor pagination keyed on score and id) and ``search_iter``
+(a lazy generator over a heap) walk all hits rather than the top ``limit``.
+
+Bodies are also indexed per H1/H2 section (see ``kg_sections``): each hit
+names its best-matching section (heading, anchor, byte range), and
+``get_section`` returns just that slice of the markdown. Token positions are
+kept too, so ``search(..., snippets=True)`` can cut a highlighted window
+around the densest cluster of matches (``kg_snippets``).
+
+Thread-safe: queries read an immutable ``IndexSnapshot`` that each rebuild
+replaces atomically (copy-on-write), so concurrent readers never block on
+a rebuild nor see a partial one.
 """
 from __future__ import annotations
 
+import base64
+import copy
+import dataclasses
+import hashlib
+import heapq
 import json
+import marshal
+import os
 import re
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, OrderedDict
 from dataclasses import dataclass, field
+from itertools import islice
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, ClassVar, Iterable, Iterator
 
 from agentloom import REPO_ROOT
+from agentloom.kg.kg_centrality import CHILD_LABEL, node_edges, pagerank
+from agentloom.kg.kg_fuzzy import PrefixIndex, edits1
+from agentloom.kg.kg_scoring import FIELDS, Scorer, default_scorers
+from agentloom.kg.kg_sections import BodyScan, Section, scan_markdown
+from agentloom.kg.kg_snippets import SNIPPET_CHARS, densest_window, highlight
+from agentloom.kg.kg_tfidf import TfidfMatrix
+from agentloom.kg.kg_watch import Watcher
+from agentloom.kg.proposal_index import ProposalEntry, ProposalIndex
+
 KG_DIR = REPO_ROOT / "agents" / "knowledge-graphs"
 PROPOSALS_DIR = KG_DIR / "proposals"
 DOCS_ROOT = REPO_ROOT / "docs"
+CACHE_DIR = REPO_ROOT / ".agentloom" / "cache"
+# Bump whenever the persisted index layout changes; stale caches are ignored.
+CACHE_FORMAT = 6
+# Only the first DEFAULT_MAX_BODY_BYTES bytes of a body are tokenized
+# (see KGIndex.max_body_bytes).
+DEFAULT_MAX_BODY_BYTES = 2 * 1024 * 1024
+# Upper bounds on prefix-range scans, keeping fuzzy lookups O(log V + const).
+_FUZZY_PREFIX_SCAN = 256
+_AUTOCOMPLETE_SCAN = 4096
 
 KG_FILES: dict[str, tuple[Path, str]] = {
     "builder-knowledge": (KG_DIR / "builder-knowledge-graph.json", "nodes"),
@@ -26,8 +79,19 @@ KG_FILES: dict[str, tuple[Path, str]] = {
 }
 
 
+# Facets reported by search_faceted(), in output order.
+FACETS = ("role", "track", "type", "category", "status")
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def _terms(text: str) -> list[str]:
+    """All tokens of ``text`` in order, duplicates kept (for term frequencies)."""
+    return _TOKEN_RE.findall(text.lower())
+
+
 def _tokenize(text: str) -> set[str]:
-    return set(re.findall(r"[a-z0-9]+", text.lower()))
+    return set(_terms(text))
 
 
 def _query_tokens(query: str) -> set[str]:
@@ -52,82 +116,913 @@ def _node_fields(node: dict) -> tuple[str, str, str, str]:
     return nid, str(title), str(desc), str(path)
 
 
+def _node_kind(node: dict) -> tuple[str, str]:
+    """Return (type, category), "" when absent."""
+    data = node.get("data") if isinstance(node.get("data"), dict) else {}
+    kind = node.get("type") or data.get("type") or ""
+    category = data.get("category") or node.get("category") or ""
+    return str(kind), str(category)
+
+
+def _bitset(docs: Iterable[int]) -> int:
+    """Doc ids as an int bitset (bit ``doc`` set), built in O(max doc / 8)."""
+    docs = list(docs)
+    if not docs:
+        return 0
+    buf = bytearray(max(docs) // 8 + 1)
+    for doc in docs:
+        buf[doc >> 3] |= 1 << (doc & 7)
+    return int.from_bytes(buf, "little")
+
+
 def _graph_meta(source: str) -> tuple[str, str]:
     role = "builder" if source.startswith("builder") else "domain"
     track = source.split("-", 1)[1]
     return role, track
 
 
-@dataclass
+# Graph sources by integer code (IndexedNode.source_code), with their role/track.
+SOURCES: tuple[str, ...] = tuple(KG_FILES)
+_SOURCE_META: tuple[tuple[str, str], ...] = tuple(_graph_meta(s) for s in SOURCES)
+_SOURCE_CODES: dict[str, int] = {s: i for i, s in enumerate(SOURCES)}
+
+
+@dataclass(slots=True)
 class IndexedNode:
+    """What the index keeps per node; sized for ~1M nodes per process.
+
+    Slotted, with role/track/source packed into one ``source_code`` and
+    repeated strings interned. The raw node dict is not kept: ``pos`` locates
+    it in its graph file, and ``KGIndex.get_node`` re-reads it on demand.
+    Only what search, facets and centrality need is extracted up front.
+    """
+
     id: str
     title: str
     description: str
     path: str
-    role: str
-    track: str
-    source: str
-    node: dict
-    body_text: str = ""
+    source_code: int  # index into SOURCES
+    pos: int  # index of the raw node in its graph file's node list
+    kind: str = ""  # node "type"
+    category: str = ""
+    edges: tuple[tuple[str, str, str], ...] = ()  # see kg_centrality.node_edges
+    # Handle on the markdown body at ``path``: bytes [0, body_length) were
+    # indexed. The text itself is not kept; see KGIndex._load_body.
+    body_length: int = 0
+
+    @classmethod
+    def from_raw(
+        cls, raw: dict, source: str, pos: int, body_length: int = 0
+    ) -> IndexedNode:
+        nid, title, desc, rel_path = _node_fields(raw)
+        kind, category = _node_kind(raw)
+        intern = sys.intern
+        return cls(
+            id=intern(nid),
+            title=title,
+            description=desc,
+            path=intern(rel_path),
+            source_code=_SOURCE_CODES[source],
+            pos=pos,
+            kind=intern(kind),
+            category=intern(category),
+            edges=tuple(
+                (intern(src), intern(dst), intern(label))
+                for src, dst, label in node_edges(raw)
+            ),
+            body_length=body_length,
+        )
+
+    @property
+    def source(self) -> str:
+        return SOURCES[self.source_code]
+
+    @property
+    def role(self) -> str:
+        return _SOURCE_META[self.source_code][0]
+
+    @property
+    def track(self) -> str:
+        return _SOURCE_META[self.source_code][1]
+
+    def field_terms(self) -> list[Counter[str]]:
+        """Term frequencies of the in-memory fields (every field but ``body``)."""
+        return [Counter(_terms(t)) for t in (self.id, self.title, self.description)]
+
+
+@dataclass(frozen=True)
+class _FileState:
+    """Change-detection record for one input file (graph JSON or node body)."""
+
+    mtime_ns: int
+    size: int
+    sha1: str
+
+
+def _stat(path: Path) -> tuple[int, int] | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _read_state(path: Path) -> tuple[_FileState, bytes] | None:
+    stat = _stat(path)
+    if stat is None or not path.is_file():
+        return None
+    try:
+        data = path.read_bytes()
+    except OSError:
+        return None
+    return _FileState(stat[0], stat[1], hashlib.sha1(data).hexdigest()), data
+
+
+def _fingerprint(raw: dict) -> str:
+    return hashlib.sha1(
+        json.dumps(raw, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    ).hexdigest()
+
+
+def _encode_cursor(score: float, node_id: str) -> str:
+    """Opaque ``search_page`` cursor for the hit ranked at (score, node_id)."""
+    raw = json.dumps([score.hex(), node_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
 
-    def search_blob(self) -> str:
-        return " ".join([self.id, self.title, self.description, self.body_text])
+def _decode_cursor(cursor: str) -> tuple[float, str]:
+    """(-score, node_id) — the sort key of the hit ``cursor`` points at."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        score_hex, node_id = json.loads(base64.urlsafe_b64decode(padded))
+        return -float.fromhex(score_hex), str(node_id)
+    except (ValueError, TypeError):
+        raise ValueError(f"invalid search cursor {cursor!r}") from None
+
+
+@dataclass
+class IndexSnapshot:
+    """One complete version of the index tables, never mutated once published.
+
+    ``KGIndex`` builds the next version on a fork of the current one (see
+    ``fork``) and publishes it with a single attribute assignment, so a
+    reader that takes ``KGIndex.snapshot()`` once and reads only from it can
+    never observe a half-applied rebuild. The lazily derived lookups at the
+    bottom are the exception: each is filled by one assignment of a complete
+    object (two readers racing to build one just do the work twice).
+    """
+
+    # Bumped by every rebuild that changes the indexed corpus.
+    generation: int = 0
+    # doc id -> node; doc ids of removed nodes are recycled via _free_docs
+    _nodes: dict[int, IndexedNode] = field(default_factory=dict)
+    _free_docs: list[int] = field(default_factory=list)
+    # token -> {doc id: per-field term frequencies (FIELDS order)}
+    _postings: dict[str, dict[int, tuple[int, ...]]] = field(default_factory=dict)
+    # doc id -> per-field token counts (FIELDS order)
+    _field_lengths: dict[int, tuple[int, ...]] = field(default_factory=dict)
+    _field_totals: list[int] = field(default_factory=lambda: [0] * len(FIELDS))
+    _avg_field_lengths: tuple[float, ...] = (0.0,) * len(FIELDS)
+    # node id -> doc id (first registered); later docs reusing an id wait in _id_dups
+    _by_id: dict[str, int] = field(default_factory=dict)
+    _id_dups: dict[str, list[int]] = field(default_factory=dict)
+    # token -> {doc id: indices of the body sections containing it}
+    _section_postings: dict[str, dict[int, tuple[int, ...]]] = field(default_factory=dict)
+    # doc id -> heading-delimited sections of its body (docs with a body only)
+    _sections: dict[int, tuple[Section, ...]] = field(default_factory=dict)
+    # token -> {doc id: byte offsets of its first occurrences in the body}
+    _positions: dict[str, dict[int, tuple[int, ...]]] = field(default_factory=dict)
+    # doc id -> distinct tokens, so a doc's postings can be removed without its text
+    _doc_terms: dict[int, tuple[str, ...]] = field(default_factory=dict)
+    # source -> state of its graph file, and node fingerprint -> doc ids
+    _graph_states: dict[str, _FileState] = field(default_factory=dict)
+    _source_docs: dict[str, dict[str, list[int]]] = field(default_factory=dict)
+    # body rel_path -> state (None when missing), and the docs that embed it
+    _body_states: dict[str, _FileState | None] = field(default_factory=dict)
+    _body_refs: dict[str, set[int]] = field(default_factory=dict)
+
+    # Derived lookups, built on first use. Prefix indexes: every indexed term
+    # (payload: document frequency), and every id/title token plus full ids
+    # (payload: doc id) for autocomplete.
+    _vocab: tuple[PrefixIndex[int], PrefixIndex[int]] | None = field(
+        default=None, repr=False
+    )
+    # TF-IDF matrix for mode="tfidf" / similar()
+    _tfidf: TfidfMatrix | None = field(default=None, repr=False)
+    # (link set, PageRank per node id) over the graph edges
+    _centrality: tuple[frozenset[tuple[str, str]], dict[str, float]] | None = field(
+        default=None, repr=False
+    )
+    # facet -> value -> bitset of the docs with that value (role, track, type, category)
+    _facet_bits: dict[str, dict[str, int]] | None = field(default=None, repr=False)
+
+    # Tables that make up the persisted index state (see KGIndex.cache_path).
+    TABLES: ClassVar[tuple[str, ...]] = (
+        "_nodes", "_free_docs", "_postings", "_field_lengths", "_field_totals",
+        "_avg_field_lengths", "_by_id", "_id_dups", "_doc_terms",
+        "_section_postings", "_sections", "_positions",
+        "_graph_states", "_source_docs", "_body_states", "_body_refs",
+    )
+    _DERIVED: ClassVar[tuple[str, ...]] = ("_vocab", "_tfidf", "_centrality", "_facet_bits")
+
+    def fork(self) -> IndexSnapshot:
+        """A draft to build the next version on.
+
+        Tables are copied one level deep; containers nested in them are
+        still shared and must be copied before they are modified (see
+        ``_IndexWriter``). O(nodes + terms) pointer copies.
+        """
+        draft = IndexSnapshot(generation=self.generation)
+        for name in self.TABLES:
+            setattr(draft, name, copy.copy(getattr(self, name)))
+        return draft
+
+    def keep_derived(self, previous: IndexSnapshot) -> None:
+        """Reuse ``previous``'s derived lookups (same corpus, same generation)."""
+        for name in self._DERIVED:
+            setattr(self, name, getattr(previous, name))
+
+    def vocab(self) -> tuple[PrefixIndex[int], PrefixIndex[int]]:
+        """(term prefixes, id/title label prefixes), built on first use."""
+        if self._vocab is None:
+            terms = PrefixIndex.build(
+                (tok, len(posting)) for tok, posting in self._postings.items()
+            )
+            labels: list[tuple[str, int]] = []
+            for doc, n in self._nodes.items():
+                labels.append((n.id.lower(), doc))
+                labels.extend((tok, doc) for tok in set(_terms(f"{n.id} {n.title}")))
+            self._vocab = (terms, PrefixIndex.build(labels))
+        return self._vocab
+
+    def tfidf(self) -> TfidfMatrix:
+        """The corpus TF-IDF matrix (needs NumPy/SciPy), built on first use."""
+        if self._tfidf is None:
+            self._tfidf = TfidfMatrix.build(self)
+        return self._tfidf
+
+    def centrality(
+        self, previous: tuple[frozenset[tuple[str, str]], dict[str, float]] | None = None
+    ) -> tuple[frozenset[tuple[str, str]], dict[str, float]]:
+        """(link set, PageRank per node id), warm-started from ``previous``."""
+        if self._centrality is None:
+            links: set[tuple[str, str]] = set()
+            for n in self._nodes.values():
+                for src, dst, label in n.edges:
+                    # Rank flows along references: a child endorses its parent,
+                    # a node endorses what it links to.
+                    links.add((dst, src) if label == CHILD_LABEL else (src, dst))
+            frozen = frozenset(links)
+            if (
+                previous is not None
+                and previous[0] == frozen
+                and previous[1].keys() == self._by_id.keys()
+            ):
+                self._centrality = previous
+            else:
+                ranks, _ = pagerank(
+                    self._by_id, frozen, start=previous[1] if previous else None
+                )
+                self._centrality = (frozen, ranks)
+        return self._centrality
+
+    def facet_bits(self) -> dict[str, dict[str, int]]:
+        if self._facet_bits is None:
+            groups: dict[str, dict[str, list[int]]] = {f: {} for f in FACETS[:-1]}
+            for doc, n in self._nodes.items():
+                for facet, value in (
+                    ("role", n.role), ("track", n.track),
+                    ("type", n.kind), ("category", n.category),
+                ):
+                    if value:
+                        groups[facet].setdefault(value, []).append(doc)
+            self._facet_bits = {
+                facet: {value: _bitset(docs) for value, docs in sorted(values.items())}
+                for facet, values in groups.items()
+            }
+        return self._facet_bits
+
+
+class _IndexWriter:
+    """Applies one incremental sync to a draft from ``IndexSnapshot.fork``.
+
+    Nested containers (posting lists, duplicate-id lists, body reference
+    sets, ``IndexedNode`` records) may still be shared with the published
+    snapshot, so each is copied before its first modification in this draft.
+    """
+
+    def __init__(self, index: KGIndex, draft: IndexSnapshot) -> None:
+        self.index = index
+        self.s = draft
+        # (id(table), key) of the nested containers already copied into the draft
+        self._owned: set[tuple[int, Any]] = set()
+
+    def _writable(self, table: dict, key: Any, factory: Callable[[], Any]) -> Any:
+        """``table[key]`` as a container private to the draft (created if missing)."""
+        mark = (id(table), key)
+        if mark not in self._owned:
+            current = table.get(key)
+            table[key] = factory() if current is None else copy.copy(current)
+            self._owned.add(mark)
+        return table[key]
+
+    def _discard(self, table: dict, key: Any) -> None:
+        del table[key]
+        self._owned.discard((id(table), key))
+
+    def scan_body(self, rel_path: str, record: bool = True) -> BodyScan:
+        """Stream a body file once: hash all of it, tokenize and section its
+        first ``max_body_bytes`` bytes (see ``kg_sections.scan_markdown``)."""
+        if not rel_path:
+            return BodyScan()
+        path = self.index._body_path(rel_path)
+        stat = _stat(path)
+        scan = BodyScan()
+        state: _FileState | None = None
+        if stat is not None and path.is_file():
+            try:
+                with path.open("rb") as fh:
+                    scan = scan_markdown(fh, self.index.max_body_bytes)
+                state = _FileState(stat[0], stat[1], scan.sha1)
+            except OSError:
+                scan = BodyScan()
+        if record:
+            self.s._body_states[rel_path] = state
+        return scan
+
+    # -- postings maintenance -------------------------------------------------
+
+    def index_doc(self, doc: int, n: IndexedNode, body: BodyScan) -> None:
+        s = self.s
+        per_field = [*n.field_terms(), body.tf]
+        terms = tuple(set().union(*per_field))
+        for tok in terms:
+            self._writable(s._postings, tok, dict)[doc] = tuple(tf[tok] for tf in per_field)
+        for tok, section_ids in body.token_sections.items():
+            self._writable(s._section_postings, tok, dict)[doc] = section_ids
+        for tok, offsets in body.positions.items():
+            self._writable(s._positions, tok, dict)[doc] = offsets
+        if body.sections:
+            s._sections[doc] = body.sections
+        lengths = tuple(sum(tf.values()) for tf in per_field)
+        for i, length in enumerate(lengths):
+            s._field_totals[i] += length
+        s._field_lengths[doc] = lengths
+        s._doc_terms[doc] = terms
+
+    def unindex_doc(self, doc: int) -> None:
+        s = self.s
+        for tok in s._doc_terms.pop(doc, ()):
+            for postings in (s._postings, s._section_postings, s._positions):
+                if tok not in postings:
+                    continue
+                posting = self._writable(postings, tok, dict)
+                posting.pop(doc, None)
+                if not posting:
+                    self._discard(postings, tok)
+        s._sections.pop(doc, None)
+        for i, length in enumerate(s._field_lengths.pop(doc, ())):
+            s._field_totals[i] -= length
+
+    def add_doc(self, raw: dict, source: str, pos: int) -> int:
+        s = self.s
+        n = IndexedNode.from_raw(raw, source, pos)
+        nid, rel_path = n.id, n.path
+        # A body already tracked for another doc keeps its recorded state,
+        # so a pending change is still picked up for every referencing doc.
+        record = rel_path not in s._body_states
+        body = self.scan_body(rel_path, record=record)
+        n.body_length = body.length
+        doc = s._free_docs.pop() if s._free_docs else len(s._nodes)
+        s._nodes[doc] = n
+        if nid in s._by_id:
+            self._writable(s._id_dups, nid, list).append(doc)
+        else:
+            s._by_id[nid] = doc
+        self.index_doc(doc, n, body)
+        if rel_path:
+            self._writable(s._body_refs, rel_path, set).add(doc)
+        return doc
+
+    def remove_doc(self, doc: int) -> None:
+        s = self.s
+        self.unindex_doc(doc)
+        n = s._nodes.pop(doc)
+        s._free_docs.append(doc)
+        dups = self._writable(s._id_dups, n.id, list) if n.id in s._id_dups else None
+        if s._by_id.get(n.id) == doc:
+            if dups:
+                s._by_id[n.id] = dups.pop(0)
+            else:
+                del s._by_id[n.id]
+        elif dups:
+            dups.remove(doc)
+        if dups is not None and not dups:
+            self._discard(s._id_dups, n.id)
+        if n.path in s._body_refs:
+            refs = self._writable(s._body_refs, n.path, set)
+            refs.discard(doc)
+            if not refs:
+                self._discard(s._body_refs, n.path)
+                s._body_states.pop(n.path, None)
+
+    def refresh_averages(self) -> None:
+        s = self.s
+        count = len(s._nodes)
+        s._avg_field_lengths = tuple(t / count if count else 0.0 for t in s._field_totals)
+
+    # -- incremental sync -----------------------------------------------------
+
+    def sync_graph(self, source: str, path: Path, key: str) -> int:
+        """Bring one graph's nodes up to date; return the number of docs touched."""
+        s = self.s
+        prev = s._graph_states.get(source)
+        if prev is not None and _stat(path) == (prev.mtime_ns, prev.size):
+            return 0
+        read = _read_state(path)
+        if read is None:
+            old_docs = s._source_docs.pop(source, {})
+            s._graph_states.pop(source, None)
+            removed = [doc for docs in old_docs.values() for doc in docs]
+            for doc in removed:
+                self.remove_doc(doc)
+            return len(removed)
+        state, data = read
+        s._graph_states[source] = state
+        if prev is not None and prev.sha1 == state.sha1:
+            return 0
+
+        kg = json.loads(data.decode("utf-8"))
+        old_docs = {fp: list(docs) for fp, docs in s._source_docs.get(source, {}).items()}
+        new_docs: dict[str, list[int]] = {}
+        touched = 0
+        for pos, raw in enumerate(kg.get(key, [])):
+            if "id" not in raw:
+                continue
+            fp = _fingerprint(raw)
+            reusable = old_docs.get(fp)
+            if reusable:
+                doc = reusable.pop()
+                if s._nodes[doc].pos != pos:
+                    s._nodes[doc] = dataclasses.replace(s._nodes[doc], pos=pos)
+            else:
+                doc = self.add_doc(raw, source, pos)
+                touched += 1
+            new_docs.setdefault(fp, []).append(doc)
+        for docs in old_docs.values():
+            for doc in docs:
+                self.remove_doc(doc)
+                touched += 1
+        s._source_docs[source] = new_docs
+        return touched
+
+    def sync_bodies(self, only: Iterable[str] | None = None) -> int:
+        """Re-index docs whose body file content changed; return docs touched.
+
+        ``only`` limits the check to those body rel paths (e.g. from a watcher).
+        """
+        s = self.s
+        touched = 0
+        refs = s._body_refs.items() if only is None else (
+            (rel_path, s._body_refs[rel_path]) for rel_path in only
+            if rel_path in s._body_refs
+        )
+        for rel_path, docs in list(refs):
+            prev = s._body_states.get(rel_path)
+            stat = _stat(self.index._body_path(rel_path))
+            if prev is not None and stat == (prev.mtime_ns, prev.size):
+                continue
+            if prev is None and stat is None:
+                continue
+            body = self.scan_body(rel_path)
+            state = s._body_states.get(rel_path)
+            if prev is not None and state is not None and prev.sha1 == state.sha1:
+                continue
+            for doc in docs:
+                self.unindex_doc(doc)
+                n = s._nodes[doc] = dataclasses.replace(s._nodes[doc], body_length=body.length)
+                self.index_doc(doc, n, body)
+                touched += 1
+        return touched
+
+
+_NODE_FIELDS = tuple(f.name for f in dataclasses.fields(IndexedNode))
+
+
+def _encode_state(snap: IndexSnapshot) -> dict[str, Any]:
+    """``snap``'s tables as plain containers, for ``marshal``."""
+    state = {name: getattr(snap, name) for name in IndexSnapshot.TABLES}
+    state["_nodes"] = {
+        doc: tuple(getattr(n, f) for f in _NODE_FIELDS) for doc, n in snap._nodes.items()
+    }
+    state["_sections"] = {
+        doc: tuple(tuple(sec) for sec in secs) for doc, secs in snap._sections.items()
+    }
+    state["_graph_states"] = {
+        source: dataclasses.astuple(st) for source, st in snap._graph_states.items()
+    }
+    state["_body_states"] = {
+        rel: None if st is None else dataclasses.astuple(st)
+        for rel, st in snap._body_states.items()
+    }
+    return state
+
+
+def _decode_state(state: dict[str, Any]) -> IndexSnapshot:
+    """Inverse of ``_encode_state``; raises on anything malformed."""
+    if set(state) != set(IndexSnapshot.TABLES):
+        raise ValueError("index cache tables do not match")
+    state = dict(state)
+    state["_nodes"] = {doc: IndexedNode(*t) for doc, t in state["_nodes"].items()}
+    state["_sections"] = {
+        doc: tuple(Section(*sec) for sec in secs) for doc, secs in state["_sections"].items()
+    }
+    state["_graph_states"] = {
+        source: _FileState(*st) for source, st in state["_graph_states"].items()
+    }
+    state["_body_states"] = {
+        rel: None if st is None else _FileState(*st)
+        for rel, st in state["_body_states"].items()
+    }
+    return IndexSnapshot(**state)
 
 
 @dataclass
 class KGIndex:
+    """Inverted index over the six KG graphs, maintained incrementally.
+
+    Each graph file and each referenced markdown body is tracked by
+    mtime/size/sha1. ``rebuild()`` re-parses only graphs whose content hash
+    changed, re-indexes only the nodes whose JSON changed in them, and
+    re-reads only body files whose hash changed (at most every
+    ``body_check_interval`` seconds, which also throttles the proposals
+    folder's per-file checks). ``rebuild(force=True)`` starts over.
+
+    Bodies are never held in memory: they are tokenized in a streaming pass
+    (only the first ``max_body_bytes`` bytes) and ``get_node`` reads the
+    text from disk on demand. Likewise raw node dicts: ``IndexedNode`` keeps
+    only what ranking needs, and ``get_node`` re-reads the node's JSON from
+    its graph file.
+
+    With ``cache_path`` set, the index state (postings, stats, node metadata
+    and the per-file hashes above) is saved there after every change and
+    loaded by the first ``rebuild()`` of a new process; the regular
+    incremental sync then re-indexes only inputs that changed since. The
+    file holds plain containers only (``marshal``, not ``pickle``), so
+    loading one planted in a checkout cannot run code.
+
+    Safe to share between threads. The tables live in an ``IndexSnapshot``
+    that is replaced, never edited: a rebuild works on a copy-on-write fork
+    and publishes it atomically. Rebuilds are single-flight; a query that
+    finds one already running answers from the current snapshot instead of
+    waiting (only the very first build is waited for). With
+    ``background_rebuild=True`` queries never rebuild at all: they wake a
+    worker thread, and concurrent wake-ups coalesce into one rebuild.
+
+    ``start_watching()`` goes further: a ``kg_watch.Watcher`` reports changes
+    to the graphs, the referenced bodies and the proposals folder, only the
+    changed inputs are re-synced, and queries do no freshness checks at all.
+    """
+
     repo_root: Path = field(default_factory=lambda: REPO_ROOT)
-    _nodes: list[IndexedNode] = field(default_factory=list, init=False)
-    _indexed_at_mtime: float = field(default=0.0, init=False)
+    scorers: dict[str, Scorer] = field(default_factory=default_scorers)
+    default_mode: str = "overlap"
+    body_check_interval: float = 2.0
+    max_body_bytes: int = DEFAULT_MAX_BODY_BYTES
+    cache_path: Path | None = None
+    result_cache_size: int = 256
+    raw_graph_cache_size: int = 2
+    background_rebuild: bool = False
+    _snap: IndexSnapshot = field(default_factory=IndexSnapshot, init=False, repr=False)
+    _built: bool = field(default=False, init=False)
+    _bodies_checked_at: float = field(default=0.0, init=False)
+    _cache_checked: bool = field(default=False, init=False)
+    # Serializes rebuilds; readers only ever try-acquire it.
+    _rebuild_lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False
+    )
+    # Guards the small shared caches below (held for dict bookkeeping only,
+    # never across I/O, scoring or a rebuild).
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    _wake: threading.Event = field(default_factory=threading.Event, init=False, repr=False)
+    _worker: threading.Thread | None = field(default=None, init=False, repr=False)
+    _closed: bool = field(default=False, init=False)
+    # Set by start_watching(): change events replace per-query freshness checks.
+    _watcher: Watcher | None = field(default=None, init=False, repr=False)
+    _owns_watcher: bool = field(default=False, init=False)
+    _unsubscribe: Callable[[], None] | None = field(default=None, init=False, repr=False)
+    # Last PageRank result, to warm-start the next snapshot's ranking
+    _last_centrality: tuple[frozenset[tuple[str, str]], dict[str, float]] | None = field(
+        default=None, init=False, repr=False
+    )
+    _proposals: ProposalIndex | None = field(default=None, init=False)
+    # LRU of search() results, valid for one (generation, proposals generation)
+    _results: OrderedDict[tuple, Any] = field(
+        default_factory=OrderedDict, init=False
+    )
+    _results_generation: tuple[int, int] = field(default=(-1, -1), init=False)
+    _result_hits: int = field(default=0, init=False)
+    _result_misses: int = field(default=0, init=False)
+    # proposal filename -> (entry, list_proposals summary, search field tokens)
+    _proposal_views: dict[
+        str, tuple[ProposalEntry, dict[str, Any], dict[str, list[str]]]
+    ] = field(default_factory=dict, init=False)
+    _proposal_views_generation: int = field(default=-1, init=False)
+    # source -> ((mtime_ns, size), raw node list) for the graphs get_node last
+    # read raw nodes from; at most raw_graph_cache_size entries
+    _raw_graphs: OrderedDict[str, tuple[tuple[int, int] | None, list[Any]]] = field(
+        default_factory=OrderedDict, init=False, repr=False
+    )
 
-    def _kg_mtime(self) -> float:
-        mtimes = []
-        for path, _ in KG_FILES.values():
-            if path.exists():
-                mtimes.append(path.stat().st_mtime)
-        return max(mtimes) if mtimes else 0.0
+    @property
+    def kg_dir(self) -> Path:
+        return self.repo_root / "agents" / "knowledge-graphs"
 
-    def _read_body(self, rel_path: str) -> str:
-        if not rel_path:
-            return ""
-        full = self.repo_root / rel_path.replace("\\", "/")
-        if not full.is_file():
+    @property
+    def proposals_dir(self) -> Path:
+        return self.kg_dir / "proposals"
+
+    @property
+    def generation(self) -> int:
+        """Generation of the published snapshot (bumped when the corpus changes)."""
+        return self._snap.generation
+
+    def _kg_files(self) -> dict[str, tuple[Path, str]]:
+        return {
+            source: (self.kg_dir / path.name, key)
+            for source, (path, key) in KG_FILES.items()
+        }
+
+    def _body_path(self, rel_path: str) -> Path:
+        return self.repo_root / rel_path.replace("\\", "/")
+
+    def _load_body(self, n: IndexedNode) -> str:
+        """Read a node's markdown body from disk (on demand, not cached)."""
+        if not n.path:
             return ""
         try:
-            return full.read_text(encoding="utf-8")
+            path = self._body_path(n.path)
+            return path.read_text(encoding="utf-8", errors="replace")
         except OSError:
             return ""
 
-    def rebuild(self, force: bool = False) -> None:
-        mtime = self._kg_mtime()
-        if not force and mtime <= self._indexed_at_mtime and self._nodes:
+    # -- persistence ----------------------------------------------------------
+
+    def _cache_key(self) -> dict[str, Any]:
+        return {
+            "format": CACHE_FORMAT,
+            "repo_root": str(self.repo_root),
+            "max_body_bytes": self.max_body_bytes,
+        }
+
+    def _load_cache(self) -> IndexSnapshot | None:
+        """Persisted snapshot from ``cache_path``, if a compatible one is there."""
+        if self.cache_path is None or not self.cache_path.is_file():
+            return None
+        try:
+            payload = marshal.loads(self.cache_path.read_bytes())
+            if not isinstance(payload, dict) or payload.get("key") != self._cache_key():
+                return None
+            return _decode_state(payload["state"])
+        except Exception:
+            # Unreadable, truncated or foreign: just build from scratch.
+            return None
+
+    def _save_cache(self, snap: IndexSnapshot) -> None:
+        if self.cache_path is None:
             return
-        nodes: list[IndexedNode] = []
-        for source, (path, key) in KG_FILES.items():
-            if not path.exists():
-                continue
-            kg = json.loads(path.read_text(encoding="utf-8"))
-            role, track = _graph_meta(source)
-            for raw in kg.get(key, []):
-                if "id" not in raw:
-                    continue
-                nid, title, desc, rel_path = _node_fields(raw)
-                body = self._read_body(rel_path)
-                nodes.append(
-                    IndexedNode(
-                        id=nid,
-                        title=title,
-                        description=desc,
-                        path=rel_path,
-                        role=role,
-                        track=track,
-                        source=source,
-                        node=raw,
-                        body_text=body,
+        payload = {
+            "key": self._cache_key(),
+            "state": _encode_state(snap),
+        }
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(
+                dir=self.cache_path.parent, prefix=self.cache_path.name, suffix=".tmp"
+            )
+        except OSError:
+            # The cache is an optimisation; a read-only checkout just skips it.
+            return
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                marshal.dump(payload, fh)
+            os.replace(tmp, self.cache_path)
+        except OSError:
+            Path(tmp).unlink(missing_ok=True)
+
+    # -- rebuild / publication ------------------------------------------------
+
+    def _stale(self, snap: IndexSnapshot, check_bodies: bool) -> bool:
+        """Whether any tracked input's mtime/size differs from ``snap``'s record."""
+        for source, (path, _) in self._kg_files().items():
+            prev = snap._graph_states.get(source)
+            stat = _stat(path)
+            if prev is None if stat is not None else prev is not None:
+                return True
+            if prev is not None and stat != (prev.mtime_ns, prev.size):
+                return True
+        if check_bodies:
+            for rel_path in snap._body_refs:
+                prev_body = snap._body_states.get(rel_path)
+                stat = _stat(self._body_path(rel_path))
+                if prev_body is None:
+                    if stat is not None:
+                        return True
+                elif stat != (prev_body.mtime_ns, prev_body.size):
+                    return True
+        return False
+
+    def rebuild(self, force: bool = False, block: bool = True) -> int:
+        """Sync the index with disk; return how many docs were (re)indexed.
+
+        Single-flight: if another thread is already rebuilding, a blocking
+        call waits for it and then checks again (normally finding nothing
+        left to do), while ``block=False`` returns 0 at once and leaves the
+        caller on the current snapshot. Before the first build completes,
+        every call blocks.
+        """
+        if not self._rebuild_lock.acquire(blocking=block or not self._built):
+            return 0
+        try:
+            return self._rebuild_locked(force)
+        finally:
+            self._rebuild_lock.release()
+
+    def _rebuild_locked(self, force: bool, bodies: Iterable[str] | None = None) -> int:
+        """One sync pass; ``bodies`` (rel paths) re-checks just those bodies now."""
+        current = self._snap
+        base = current
+        loaded = False
+        if force:
+            base = IndexSnapshot(generation=current.generation)
+            self._bodies_checked_at = 0.0
+        elif not self._cache_checked and not current._graph_states:
+            cached = self._load_cache()
+            if cached is not None:
+                cached.generation = current.generation
+                base, loaded = cached, True
+        self._cache_checked = True
+
+        now = time.monotonic()
+        check_bodies = force or now - self._bodies_checked_at >= self.body_check_interval
+        if bodies is not None:
+            check_bodies = False
+        elif not (force or loaded) and not self._stale(base, check_bodies):
+            if check_bodies:
+                self._bodies_checked_at = now
+            self._built = True
+            return 0
+
+        writer = _IndexWriter(self, base.fork())
+        touched = 0
+        for source, (path, key) in self._kg_files().items():
+            touched += writer.sync_graph(source, path, key)
+        if check_bodies:
+            touched += writer.sync_bodies()
+            self._bodies_checked_at = now
+        elif bodies is not None:
+            touched += writer.sync_bodies(bodies)
+        draft = writer.s
+        if touched or force or loaded:
+            writer.refresh_averages()
+            draft.generation = current.generation + 1
+            self._snap = draft
+            if touched or force:
+                # A cache just loaded and still current needs no rewrite.
+                self._save_cache(draft)
+        else:
+            # Only file metadata moved (e.g. touched without edits).
+            draft.keep_derived(current)
+            self._snap = draft
+        self._built = True
+        return touched
+
+    def snapshot(self) -> IndexSnapshot:
+        """The published snapshot, after the usual freshness check.
+
+        Read everything for one logical operation from the returned object;
+        it stays consistent however many rebuilds happen meanwhile.
+        """
+        if self._watcher is not None and self._built:
+            return self._snap
+        if self.background_rebuild and self._built:
+            self._request_rebuild()
+        else:
+            self.rebuild(block=False)
+        return self._snap
+
+    def _request_rebuild(self) -> None:
+        """Wake the background worker (started on first use); returns at once."""
+        if self._worker is None:
+            with self._lock:
+                if self._worker is None and not self._closed:
+                    self._worker = threading.Thread(
+                        target=self._rebuild_worker, name="kg-index-rebuild", daemon=True
                     )
-                )
-        self._nodes = nodes
-        self._indexed_at_mtime = mtime
+                    self._worker.start()
+        self._wake.set()
+
+    def _rebuild_worker(self) -> None:
+        while True:
+            self._wake.wait()
+            if self._closed:
+                return
+            # Requests arriving while this rebuild runs set the event again
+            # and are served by exactly one more pass.
+            self._wake.clear()
+            try:
+                self.rebuild()
+            except Exception:  # noqa: BLE001 - keep serving the last snapshot
+                time.sleep(self.body_check_interval)
+
+    # -- change watching -------------------------------------------------------
+
+    def start_watching(self, watcher: Watcher | None = None) -> Watcher:
+        """Keep the index hot from change events instead of per-query checks.
+
+        Watches the KG folder, the proposals folder and every referenced
+        body with ``watcher`` (shared with other consumers), or with a new
+        ``Watcher`` polling every ``body_check_interval`` seconds (watchdog
+        events when installed) that ``stop_watching`` also stops. From then
+        on queries never touch the filesystem to check freshness.
+        """
+        if self._watcher is not None:
+            return self._watcher
+        self._owns_watcher = watcher is None
+        watcher = watcher or Watcher(interval=max(self.body_check_interval, 0.05))
+        self.rebuild()
+        self._unsubscribe = watcher.subscribe(self._on_change)
+        self._watch_paths(watcher)
+        # Changes made before the baseline above was taken are synced here.
+        self.rebuild()
+        self.proposals.refresh(full=True)
+        self._watcher = watcher
+        watcher.start()
+        return watcher
+
+    def stop_watching(self) -> None:
+        """Return to per-query freshness checks."""
+        watcher, self._watcher = self._watcher, None
+        if watcher is None:
+            return
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+        watcher.unwatch(self._watch_key)
+        if self._owns_watcher:
+            watcher.stop()
+
+    @property
+    def _watch_key(self) -> str:
+        return f"kg-index-{id(self):x}"
+
+    def _watch_paths(self, watcher: Watcher) -> None:
+        bodies = [self._body_path(rel_path) for rel_path in self._snap._body_refs]
+        watcher.watch(self._watch_key, files=bodies, dirs=[self.kg_dir, self.proposals_dir])
+
+    def _on_change(self, paths: set[Path]) -> None:
+        """Watcher callback: re-sync just the inputs named in ``paths``."""
+        if any(p == self.proposals_dir or p.parent == self.proposals_dir for p in paths):
+            self.proposals.refresh(full=True)
+        graphs = {path: source for source, (path, _) in self._kg_files().items()}
+        changed_graphs = [graphs[p] for p in paths if p in graphs]
+        body_paths = {self._body_path(r): r for r in self._snap._body_refs}
+        changed_bodies = [body_paths[p] for p in paths if p in body_paths]
+        if not (changed_graphs or changed_bodies):
+            return
+        with self._lock:
+            for source in changed_graphs:
+                self._raw_graphs.pop(source, None)
+        with self._rebuild_lock:
+            self._rebuild_locked(False, bodies=changed_bodies)
+        watcher = self._watcher
+        if watcher is not None:
+            # Nodes added or removed may reference other bodies now.
+            self._watch_paths(watcher)
+
+    def _refresh_proposals(self) -> None:
+        if self._watcher is None:
+            self.proposals.refresh()
+
+    def close(self) -> None:
+        """Stop the background rebuild worker and the watcher, if started."""
+        self.stop_watching()
+        self._closed = True
+        self._wake.set()
+        worker = self._worker
+        if worker is not None and worker is not threading.current_thread():
+            worker.join()
+
+    # -- search ---------------------------------------------------------------
+
+    def _scorer(self, mode: str | None) -> Scorer:
+        name = mode or self.default_mode
+        try:
+            return self.scorers[name]
+        except KeyError:
+            raise ValueError(
+                f"unknown search mode {name!r}; expected one of {sorted(self.scorers)}"
+            ) from None
 
     def search(
         self,
@@ -135,30 +1030,425 @@ class KGIndex:
         limit: int = 5,
         role: str | None = None,
         track: str | None = None,
+        mode: str | None = None,
+        fuzzy: bool = False,
+        boost: float = 0.0,
+        snippets: bool = False,
     ) -> list[dict[str, Any]]:
-        self.rebuild()
-        q_tokens = _query_tokens(query)
-        if not q_tokens:
-            return []
+        """Rank accepted nodes and pending proposals against ``query``.
 
-        scored: list[tuple[float, IndexedNode]] = []
-        for n in self._nodes:
-            if role and n.role != role:
+        ``mode`` picks a scorer from ``self.scorers`` (default
+        ``self.default_mode``); scores are only comparable within one mode.
+        With ``fuzzy=True``, query tokens absent from the index fall back to
+        their most frequent indexed neighbour within edit distance 1, or else
+        to their most frequent prefix completion (tokens of 3+ characters).
+        ``boost`` > 0 scales each accepted node's score by
+        ``1 + boost * pagerank / max(pagerank)`` (see ``centrality``), so
+        well-connected nodes win close calls; proposals are not boosted.
+        With ``snippets=True`` each hit also carries a ``snippet`` (see
+        ``kg_snippets.highlight``): the window of its body, else of its
+        description, around the densest cluster of query-term matches.
+        Results are served from an LRU cache (see ``cache_info``) until the
+        index or the proposals folder changes.
+        """
+        [results] = self.search_many(
+            [query], limit=limit, role=role, track=track, mode=mode,
+            fuzzy=fuzzy, boost=boost, snippets=snippets,
+        )
+        return results
+
+    def search_many(
+        self,
+        queries: Iterable[str],
+        limit: int = 5,
+        role: str | None = None,
+        track: str | None = None,
+        mode: str | None = None,
+        fuzzy: bool = False,
+        boost: float = 0.0,
+        snippets: bool = False,
+    ) -> list[list[dict[str, Any]]]:
+        """Run several searches against one consistent view of the index.
+
+        The freshness check and the proposals snapshot happen once for the
+        whole batch; results come back in input order, one list per query,
+        exactly as ``search`` would return them.
+        """
+        scorer = self._scorer(mode)
+        s = self.snapshot()
+        self._refresh_proposals()
+        generation = self._results_generation_for(s)
+        batch: list[list[dict[str, Any]] | None] = []
+        # key -> (query, tokens, positions in batch) for every cache miss
+        misses: dict[tuple, tuple[str, set[str], list[int]]] = {}
+        for query in queries:
+            q_tokens = _query_tokens(query)
+            if not q_tokens:
+                batch.append([])
                 continue
-            if track and n.track != track:
+            key = (
+                tuple(query.lower().split()), role, track, limit,
+                mode or self.default_mode, fuzzy, boost, snippets,
+            )
+            if key in misses:
+                misses[key][2].append(len(batch))
+                batch.append(None)
                 continue
-            n_tokens = _tokenize(n.search_blob())
-            shared = q_tokens & n_tokens
-            if not shared:
+            cached = self._cached_results(generation, key)
+            if cached is None:
+                misses[key] = (query, q_tokens, [len(batch)])
+            batch.append(cached)
+        if misses:
+            proposals = (
+                self._proposal_snapshot(refresh=False)
+                if not role or role == "domain" else []
+            )
+            token_sets = [
+                self._fuzzy_tokens(s, q_tokens) if fuzzy else q_tokens
+                for _, q_tokens, _ in misses.values()
+            ]
+            queries_missed = [query for query, _, _ in misses.values()]
+            all_scores = self._score_queries(s, scorer, queries_missed, token_sets, boost)
+            for (key, (_, _, slots)), q_tokens, scores in zip(
+                misses.items(), token_sets, all_scores
+            ):
+                prop_hits = self._score_proposals(s, scorer, q_tokens, proposals)
+                results = self._search_uncached(
+                    s, q_tokens, scores, limit, role, track, prop_hits, snippets
+                )
+                self._store_results(generation, key, results)
+                for slot in slots:
+                    batch[slot] = copy.deepcopy(results)
+        return batch  # type: ignore[return-value]
+
+    def search_faceted(
+        self,
+        query: str,
+        limit: int = 5,
+        role: str | None = None,
+        track: str | None = None,
+        mode: str | None = None,
+        fuzzy: bool = False,
+        boost: float = 0.0,
+        snippets: bool = False,
+    ) -> dict[str, Any]:
+        """``search`` plus hit counts per facet, from the same scoring pass.
+
+        Returns ``{"results": search(...), "facets": {facet: {value: count}}}``
+        for the facets in ``FACETS``; counts cover every match, not just the
+        first ``limit``. Each facet is counted with the *other* filters
+        applied, so ``facets["role"]`` shows what each ``role=`` would
+        match under the current ``track=`` (and vice versa). ``status``
+        splits ``accepted`` nodes from ``pending_proposal`` hits.
+        """
+        scorer = self._scorer(mode)
+        s = self.snapshot()
+        self._refresh_proposals()
+        q_tokens = _query_tokens(query)
+        if not q_tokens:
+            return {"results": [], "facets": {f: {} for f in FACETS}}
+        key = (
+            "facets", tuple(query.lower().split()), role, track, limit,
+            mode or self.default_mode, fuzzy, boost, snippets,
+        )
+        generation = self._results_generation_for(s)
+        cached = self._cached_results(generation, key)
+        if cached is not None:
+            return cached
+        if fuzzy:
+            q_tokens = self._fuzzy_tokens(s, q_tokens)
+        [scores] = self._score_queries(s, scorer, [query], [q_tokens], boost)
+        # Proposals are scored regardless of ``role`` so the role facet can
+        # count them; results only include them when search() would.
+        prop_hits = self._score_proposals(
+            s, scorer, q_tokens, self._proposal_snapshot(refresh=False)
+        )
+        shown = prop_hits if not role or role == "domain" else []
+        out = {
+            "results": self._search_uncached(
+                s, q_tokens, scores, limit, role, track, shown, snippets
+            ),
+            "facets": self._facet_counts(s, scores, role, track, prop_hits),
+        }
+        self._store_results(generation, key, out)
+        return copy.deepcopy(out)
+
+    # -- pagination -----------------------------------------------------------
+
+    def search_page(
+        self,
+        query: str,
+        limit: int = 20,
+        cursor: str | None = None,
+        role: str | None = None,
+        track: str | None = None,
+        mode: str | None = None,
+        fuzzy: bool = False,
+        boost: float = 0.0,
+        snippets: bool = False,
+    ) -> dict[str, Any]:
+        """One page of hits: ``{"results": [...], "next_cursor": str | None}``.
+
+        Hits are ordered by (score desc, id) over accepted nodes and pending
+        proposals together. Pass ``next_cursor`` back (with the same query
+        and filters) for the following page; it encodes the last hit's
+        (score, id), so paging neither repeats nor skips unchanged nodes
+        when the index changes in between. Each page selects its hits with
+        a bounded heap over the cached candidate list: O(n log limit),
+        however deep the page.
+        """
+        scorer = self._scorer(mode)
+        after = _decode_cursor(cursor) if cursor else None
+        s = self.snapshot()
+        self._refresh_proposals()
+        q_tokens, ranked = self._ranked(s, scorer, query, role, track, mode, fuzzy, boost)
+        pool = ranked if after is None else (c for c in ranked if c[:2] > after)
+        top = heapq.nsmallest(max(1, limit) + 1, pool)
+        more = len(top) > max(1, limit)
+        top = top[: max(1, limit)]
+        return {
+            "results": [
+                self._hit(s, q_tokens, -neg, ref, snippets) for neg, _, _, ref in top
+            ],
+            "next_cursor": _encode_cursor(-top[-1][0], top[-1][1]) if more else None,
+        }
+
+    def search_iter(
+        self,
+        query: str,
+        cursor: str | None = None,
+        role: str | None = None,
+        track: str | None = None,
+        mode: str | None = None,
+        fuzzy: bool = False,
+        boost: float = 0.0,
+        snippets: bool = False,
+    ) -> Iterator[dict[str, Any]]:
+        """Every hit for ``query`` in ``search_page`` order, produced lazily.
+
+        Candidates are heapified once and popped one at a time, so stopping
+        after k hits costs O(n + k log n) and only k result dicts are ever
+        built. ``cursor`` (from ``search_page``) resumes after that hit. The
+        whole iteration reads one snapshot of the index.
+        """
+        scorer = self._scorer(mode)
+        after = _decode_cursor(cursor) if cursor else None
+        s = self.snapshot()
+        self._refresh_proposals()
+        q_tokens, ranked = self._ranked(s, scorer, query, role, track, mode, fuzzy, boost)
+        heap = list(ranked) if after is None else [c for c in ranked if c[:2] > after]
+        heapq.heapify(heap)
+
+        def hits() -> Iterator[dict[str, Any]]:
+            while heap:
+                neg, _, _, ref = heapq.heappop(heap)
+                yield self._hit(s, q_tokens, -neg, ref, snippets)
+
+        return hits()
+
+    def _ranked(
+        self,
+        s: IndexSnapshot,
+        scorer: Scorer,
+        query: str,
+        role: str | None,
+        track: str | None,
+        mode: str | None,
+        fuzzy: bool,
+        boost: float,
+    ) -> tuple[set[str], list[tuple[float, str, int, int | dict[str, Any]]]]:
+        """(query tokens, every hit as ``(-score, id, seq, ref)``), unsorted.
+
+        ``ref`` is a doc id or a proposal summary; ``seq`` keeps tuples with
+        equal (score, id) comparable. Cached with the search results and
+        shared between callers, so never mutated.
+        """
+        q_tokens = _query_tokens(query)
+        if not q_tokens:
+            return q_tokens, []
+        key = (
+            "ranked", tuple(query.lower().split()), role, track,
+            mode or self.default_mode, fuzzy, boost,
+        )
+        generation = self._results_generation_for(s)
+        cached = self._cached_results(generation, key, share=True)
+        if cached is not None:
+            return cached
+        if fuzzy:
+            q_tokens = self._fuzzy_tokens(s, q_tokens)
+        [scores] = self._score_queries(s, scorer, [query], [q_tokens], boost)
+        ranked: list[tuple[float, str, int, int | dict[str, Any]]] = []
+        for doc, score in scores.items():
+            n = s._nodes[doc]
+            if (role and n.role != role) or (track and n.track != track):
                 continue
-            score = len(shared) / len(q_tokens)
-            if n.id.lower() in query.lower():
-                score += 0.5
-            scored.append((score, n))
+            ranked.append((-score, n.id, len(ranked), doc))
+        if not role or role == "domain":
+            # As in search(): a proposal for a node that already matched is dropped.
+            seen = {c[1] for c in ranked}
+            prop_hits = self._score_proposals(
+                s, scorer, q_tokens, self._proposal_snapshot(refresh=False)
+            )
+            for score, p in sorted(prop_hits, key=lambda x: (-x[0], x[1].get("node_id") or "")):
+                nid = p.get("node_id") or ""
+                if nid in seen:
+                    continue
+                seen.add(nid)
+                ranked.append((-score, nid, len(ranked), p))
+        out = (q_tokens, ranked)
+        self._store_results(generation, key, out)
+        return out
 
-        scored.sort(key=lambda x: (-x[0], x[1].id))
+    def _score_queries(
+        self,
+        s: IndexSnapshot,
+        scorer: Scorer,
+        queries: list[str],
+        token_sets: list[set[str]],
+        boost: float,
+    ) -> list[dict[int, float]]:
+        score_many = getattr(scorer, "score_index_many", None)
+        if score_many is not None:
+            all_scores = score_many(s, token_sets)
+        else:
+            all_scores = [
+                scorer.score_index(s, q_tokens, query)
+                for query, q_tokens in zip(queries, token_sets)
+            ]
+        if boost:
+            all_scores = [self._boosted(s, scores, boost) for scores in all_scores]
+        return all_scores
+
+    def _score_proposals(
+        self,
+        s: IndexSnapshot,
+        scorer: Scorer,
+        q_tokens: set[str],
+        proposals: list[tuple[dict[str, Any], dict[str, list[str]]]],
+    ) -> list[tuple[float, dict[str, Any]]]:
+        """(score, summary) for every pending proposal matching the query."""
+        hits = []
+        for p, fields in proposals:
+            score = scorer.score_fields(s, q_tokens, fields)
+            if score > 0:
+                hits.append((score, p))
+        return hits
+
+    # -- facets ---------------------------------------------------------------
+
+    def _facet_counts(
+        self,
+        s: IndexSnapshot,
+        scores: dict[int, float],
+        role: str | None,
+        track: str | None,
+        prop_hits: list[tuple[float, dict[str, Any]]],
+    ) -> dict[str, dict[str, int]]:
+        bits = s.facet_bits()
+        matched = _bitset(scores)
+        # -1 is the all-ones bitset: no filter.
+        by_role = bits["role"].get(role, 0) if role else -1
+        by_track = bits["track"].get(track, 0) if track else -1
+        both = matched & by_role & by_track
+        pools = {
+            "role": matched & by_track,
+            "track": matched & by_role,
+            "type": both,
+            "category": both,
+        }
+        facets: dict[str, dict[str, int]] = {}
+        for facet, pool in pools.items():
+            counts = {}
+            for value, docs in bits[facet].items():
+                n = (pool & docs).bit_count()
+                if n:
+                    counts[value] = n
+            facets[facet] = counts
+        facets["status"] = {"accepted": both.bit_count()} if both else {}
+
+        # Pending proposals always land in role "domain", track "knowledge"
+        # (as in search results); type/category come from their payload.
+        def bump(facet: str, value: str) -> None:
+            if value:
+                facets[facet][value] = facets[facet].get(value, 0) + 1
+
+        def pending(pool: int) -> list[dict[str, Any]]:
+            # As in search(): a proposal for a node that already matched in
+            # ``pool`` (or for one an earlier proposal targets) is dropped.
+            seen = {s._nodes[doc].id for doc in scores if pool >> doc & 1}
+            kept = []
+            for _, p in sorted(prop_hits, key=lambda x: (-x[0], x[1].get("node_id") or "")):
+                nid = p.get("node_id") or ""
+                if nid not in seen:
+                    seen.add(nid)
+                    kept.append(p)
+            return kept
+
+        if not track or track == "knowledge":
+            for _ in pending(matched & by_track & bits["role"].get("domain", 0)):
+                bump("role", "domain")
+        if not role or role == "domain":
+            for p in pending(both):
+                bump("track", "knowledge")
+                bump("status", "pending_proposal")
+                view = self._proposal_views.get(p.get("filename") or "")
+                kind, category = _node_kind(view[0].payload) if view else ("", "")
+                bump("type", kind)
+                bump("category", category)
+        return facets
+
+    # -- graph centrality -----------------------------------------------------
+
+    def _centrality_of(self, s: IndexSnapshot) -> dict[str, float]:
+        result = s.centrality(self._last_centrality)
+        self._last_centrality = result
+        return result[1]
+
+    def centrality(self) -> dict[str, float]:
+        """PageRank of every accepted node over the merged graph edges.
+
+        Parent references and ``links`` targets count as endorsements.
+        Recomputed only when the edge set or node set changes, warm-started
+        from the previous vector.
+        """
+        return dict(self._centrality_of(self.snapshot()))
+
+    def _boosted(
+        self, s: IndexSnapshot, scores: dict[int, float], boost: float
+    ) -> dict[int, float]:
+        ranks = self._centrality_of(s)
+        top = max(ranks.values(), default=0.0)
+        if not top:
+            return scores
+        return {
+            doc: score * (1.0 + boost * ranks.get(s._nodes[doc].id, 0.0) / top)
+            for doc, score in scores.items()
+        }
+
+    # -- TF-IDF similarity ----------------------------------------------------
+
+    def tfidf(self) -> TfidfMatrix:
+        """The corpus TF-IDF matrix (needs NumPy/SciPy); rebuilt once per generation."""
+        return self.snapshot().tfidf()
+
+    def similar(self, node_id: str, k: int = 10) -> list[dict[str, Any]]:
+        """The ``k`` accepted nodes most cosine-similar to ``node_id``.
+
+        Uses the TF-IDF matrix (see ``tfidf``), so it needs NumPy/SciPy.
+        Returns ``[]`` for an unknown id; the node itself is excluded.
+        """
+        s = self.snapshot()
+        doc = s._by_id.get(node_id)
+        if doc is None:
+            return []
+        tfidf = s.tfidf()
+        row = tfidf.matrix[tfidf.rows[doc]]
+        [scores] = tfidf.cosine(row)
+        scores.pop(doc, None)
+        ranked = sorted(scores.items(), key=lambda x: (-x[1], s._nodes[x[0]].id))
         out = []
-        for score, n in scored[: max(1, limit)]:
+        for other, score in ranked[: max(0, k)]:
+            n = s._nodes[other]
             out.append(
                 {
                     "id": n.id,
@@ -167,107 +1457,442 @@ class KGIndex:
                     "track": n.track,
                     "path": n.path,
                     "score": round(score, 3),
-                    "description_preview": n.description[:240],
-                    "status": "accepted",
                 }
             )
+        return out
 
-        # Also match pending proposals (not yet in live KG graphs).
-        prop_hits: list[tuple[float, dict[str, Any]]] = []
-        if not role or role == "domain":
-            for p in self.list_proposals():
-                blob = " ".join(
-                    [
-                        p.get("node_id") or "",
-                        p.get("title") or "",
-                        p.get("description_preview") or "",
-                        p.get("slug") or "",
-                    ]
-                )
-                p_tokens = _tokenize(blob)
-                shared = q_tokens & p_tokens
-                if not shared:
+    # -- fuzzy / prefix matching ----------------------------------------------
+
+    def _fuzzy_tokens(self, s: IndexSnapshot, q_tokens: set[str]) -> set[str]:
+        """Swap tokens with no postings for their closest indexed term."""
+        out: set[str] = set()
+        for tok in q_tokens:
+            if tok in s._postings:
+                out.add(tok)
+                continue
+            near = [t for t in edits1(tok) if t in s._postings]
+            if near:
+                out.add(min(near, key=lambda t: (-len(s._postings[t]), t)))
+                continue
+            if len(tok) >= 3:
+                term_prefixes, _ = s.vocab()
+                completions = islice(term_prefixes.scan(tok), _FUZZY_PREFIX_SCAN)
+                best = min(completions, key=lambda p: (-p[1], p[0]), default=None)
+                if best is not None:
+                    out.add(best[0])
                     continue
-                score = len(shared) / len(q_tokens)
-                if "iso3166" in q_tokens and "iso3166" in p_tokens:
-                    score += 0.5
-                prop_hits.append((score, p))
+            out.add(tok)
+        return out
+
+    def autocomplete(self, prefix: str, limit: int = 10) -> list[dict[str, Any]]:
+        """Nodes whose id, or a word of whose id/title, starts with ``prefix``.
 
-        prop_hits.sort(key=lambda x: (-x[0], x[1].get("node_id") or ""))
+        Every word of ``prefix`` but the last must appear in the node's id or
+        title; the last is matched as a prefix (or, when nothing matches, as
+        a prefix within edit distance 1). Accepted nodes only.
+        """
+        s = self.snapshot()
+        _, label_prefixes = s.vocab()
+        text = prefix.strip().lower()
+        words = _terms(text)
+        if not text or not words:
+            return []
+        required = set(words[:-1])
+        found: dict[int, None] = {}
+
+        def collect(key: str, check_words: bool) -> None:
+            for _, doc in islice(label_prefixes.scan(key), _AUTOCOMPLETE_SCAN):
+                if len(found) >= limit:
+                    return
+                if doc in found:
+                    continue
+                n = s._nodes[doc]
+                if check_words and not required <= _tokenize(f"{n.id} {n.title}"):
+                    continue
+                found[doc] = None
+
+        collect(text, check_words=False)
+        collect(words[-1], check_words=True)
+        if not found and len(words[-1]) >= 3:
+            for candidate in sorted(edits1(words[-1])):
+                collect(candidate, check_words=True)
+                if len(found) >= limit:
+                    break
+        out = []
+        for doc in found:
+            n = s._nodes[doc]
+            out.append(
+                {"id": n.id, "title": n.title, "role": n.role, "track": n.track, "path": n.path}
+            )
+        return out
+
+    # -- result cache ---------------------------------------------------------
+
+    def _results_generation_for(self, s: IndexSnapshot) -> tuple[int, int]:
+        """The (snapshot, proposals) generation results computed now belong to.
+
+        Read it *before* taking the proposals snapshot used for scoring and
+        pass the same pair to ``_cached_results`` and ``_store_results``: a
+        proposals refresh in between then only labels newer results with an
+        older generation, which the next lookup clears, never stale results
+        with a newer one.
+        """
+        return (s.generation, self.proposals.generation)
+
+    def _cached_results(
+        self, generation: tuple[int, int], key: tuple, share: bool = False
+    ) -> Any:
+        """Deep copy of the cached search()/search_faceted() result, or None.
+
+        ``share=True`` returns the cached object itself (callers must not
+        mutate it).
+        """
+        with self._lock:
+            if generation > self._results_generation:
+                self._results.clear()
+                self._results_generation = generation
+            hit = self._results.get(key) if generation == self._results_generation else None
+            if hit is None:
+                self._result_misses += 1
+                return None
+            self._results.move_to_end(key)
+            self._result_hits += 1
+        return hit if share else copy.deepcopy(hit)
+
+    def _store_results(self, generation: tuple[int, int], key: tuple, results: Any) -> None:
+        if self.result_cache_size <= 0:
+            return
+        with self._lock:
+            # A reader still on an older snapshot must not pollute the cache.
+            if generation != self._results_generation:
+                return
+            self._results[key] = results
+            while len(self._results) > self.result_cache_size:
+                self._results.popitem(last=False)
+
+    def cache_info(self) -> dict[str, int]:
+        """Search result cache counters, in the spirit of ``functools.lru_cache``."""
+        return {
+            "hits": self._result_hits,
+            "misses": self._result_misses,
+            "size": len(self._results),
+            "maxsize": self.result_cache_size,
+            "generation": self.generation,
+        }
+
+    def clear_result_cache(self) -> None:
+        """Drop cached results (e.g. after re-tuning a scorer in place)."""
+        with self._lock:
+            self._results.clear()
+
+    def _search_uncached(
+        self,
+        s: IndexSnapshot,
+        q_tokens: set[str],
+        scores: dict[int, float],
+        limit: int,
+        role: str | None,
+        track: str | None,
+        prop_hits: list[tuple[float, dict[str, Any]]],
+        snippets: bool = False,
+    ) -> list[dict[str, Any]]:
+        scored: list[tuple[float, IndexedNode, int]] = []
+        for doc, score in scores.items():
+            n = s._nodes[doc]
+            if role and n.role != role:
+                continue
+            if track and n.track != track:
+                continue
+            scored.append((score, n, doc))
+
+        scored.sort(key=lambda x: (-x[0], x[1].id))
+        out = [
+            self._hit(s, q_tokens, score, doc, snippets)
+            for score, _, doc in scored[: max(1, limit)]
+        ]
+
+        # Also match pending proposals (not yet in live KG graphs).
+        prop_hits = sorted(prop_hits, key=lambda x: (-x[0], x[1].get("node_id") or ""))
+        seen_ids = {r["id"] for r in out}
         for score, p in prop_hits:
             if len(out) >= limit:
                 break
-            if any(r.get("id") == p.get("node_id") for r in out):
+            if p.get("node_id") in seen_ids:
                 continue
-            out.append(
-                {
-                    "id": p.get("node_id"),
-                    "title": p.get("title"),
-                    "role": "domain",
-                    "track": "knowledge",
-                    "path": f"agents/knowledge-graphs/proposals/{p.get('filename')}",
-                    "score": round(score, 3),
-                    "description_preview": (p.get("description_preview") or "")[:240],
-                    "status": "pending_proposal",
-                }
-            )
+            seen_ids.add(p.get("node_id"))
+            out.append(self._hit(s, q_tokens, score, p, snippets))
 
         out.sort(key=lambda r: -r["score"])
         return out[: max(1, limit)]
 
-    def get_node(self, node_id: str) -> dict[str, Any] | None:
-        self.rebuild()
-        for n in self._nodes:
-            if n.id == node_id:
-                return {
-                    "id": n.id,
-                    "title": n.title,
-                    "role": n.role,
-                    "track": n.track,
-                    "path": n.path,
-                    "node": n.node,
-                    "markdown_body": n.body_text,
-                }
-        return None
+    def _hit(
+        self,
+        s: IndexSnapshot,
+        q_tokens: set[str],
+        score: float,
+        ref: int | dict[str, Any],
+        snippets: bool = False,
+    ) -> dict[str, Any]:
+        """Result dict for an accepted node (doc id) or a proposal (summary)."""
+        if isinstance(ref, int):
+            n = s._nodes[ref]
+            hit = {
+                "id": n.id,
+                "title": n.title,
+                "role": n.role,
+                "track": n.track,
+                "path": n.path,
+                "score": round(score, 3),
+                "description_preview": n.description[:240],
+                "status": "accepted",
+                "section": self._best_section(s, ref, q_tokens),
+            }
+            if snippets:
+                hit["snippet"] = self._snippet(s, ref, q_tokens)
+            return hit
+        # Pending proposals are not yet in the live KG graphs.
+        hit = {
+            "id": ref.get("node_id"),
+            "title": ref.get("title"),
+            "role": "domain",
+            "track": "knowledge",
+            "path": f"agents/knowledge-graphs/proposals/{ref.get('filename')}",
+            "score": round(score, 3),
+            "description_preview": (ref.get("description_preview") or "")[:240],
+            "status": "pending_proposal",
+            "section": None,
+        }
+        if snippets:
+            hit["snippet"] = highlight(
+                ref.get("description_preview") or "", q_tokens, "description"
+            )
+        return hit
 
-    def list_proposals(self) -> list[dict[str, Any]]:
-        if not PROPOSALS_DIR.exists():
-            return []
-        out: list[dict[str, Any]] = []
-        for jf in sorted(PROPOSALS_DIR.glob("*.json")):
+    def _snippet(
+        self, s: IndexSnapshot, doc: int, q_tokens: set[str]
+    ) -> dict[str, Any] | None:
+        """Highlighted body window around the densest match cluster, else from
+        the description; None when only the id/title matched."""
+        n = s._nodes[doc]
+        matches = sorted(
+            (offset, offset + len(tok), tok)
+            for tok in q_tokens
+            for offset in s._positions.get(tok, {}).get(doc, ())
+        )
+        if matches:
+            lo, hi = densest_window(matches, SNIPPET_CHARS)
+            # Read a window twice the snippet size around the cluster (bytes),
+            # so highlight() can centre it and trim partial words.
+            start = max(0, (lo + hi) // 2 - SNIPPET_CHARS)
             try:
-                payload = json.loads(jf.read_text(encoding="utf-8"))
-            except json.JSONDecodeError as exc:
-                payload = {"_error": str(exc)}
-
-            data = payload.get("data") or {}
-            slug_match = re.match(r"^\d{8}-\d{6}-(.+)\.json$", jf.name)
-            slug = slug_match.group(1) if slug_match else jf.stem
-            log_name = f"UPDATE_LOG_{jf.stem.split('-', 2)[0] if slug_match else ''}_proposal_{slug}.md"
-            # match UPDATE_LOG by slug suffix
-            log_path = next(
-                (
-                    p
-                    for p in PROPOSALS_DIR.glob("UPDATE_LOG_*_proposal_*.md")
-                    if p.name.endswith(f"_proposal_{slug}.md")
-                ),
-                None,
+                with self._body_path(n.path).open("rb") as fh:
+                    fh.seek(start)
+                    data = fh.read(2 * SNIPPET_CHARS)
+            except OSError:
+                data = b""
+            text = data.decode("utf-8", errors="ignore")
+            snippet = highlight(
+                text, q_tokens, "body",
+                at_start=start == 0, at_end=len(data) < 2 * SNIPPET_CHARS,
             )
-            out.append(
-                {
-                    "filename": jf.name,
-                    "slug": slug,
-                    "node_id": payload.get("id"),
-                    "title": data.get("title") or slug,
-                    "description_preview": (data.get("description") or "")[:320],
-                    "update_log_filename": log_path.name if log_path else None,
-                }
+            if snippet is not None:
+                return snippet
+        return highlight(n.description, q_tokens, "description")
+
+    def _best_section(
+        self, s: IndexSnapshot, doc: int, q_tokens: set[str]
+    ) -> dict[str, Any] | None:
+        """The body section holding the most distinct query tokens (first wins)."""
+        hits: Counter[int] = Counter()
+        for tok in q_tokens:
+            for idx in s._section_postings.get(tok, {}).get(doc, ()):
+                hits[idx] += 1
+        if not hits:
+            return None
+        best = min(hits, key=lambda idx: (-hits[idx], idx))
+        sec = s._sections[doc][best]
+        return {
+            "heading": sec.heading,
+            "anchor": sec.anchor,
+            "byte_start": sec.start,
+            "byte_end": sec.end,
+        }
+
+    def get_section(self, node_id: str, anchor: str) -> dict[str, Any] | None:
+        """Read one heading-delimited section of a node's body from disk.
+
+        ``anchor`` is the section anchor reported in search hits (``""`` for
+        the text before the first heading). Returns ``None`` if unknown.
+        """
+        s = self.snapshot()
+        doc = s._by_id.get(node_id)
+        if doc is None:
+            return None
+        sec = next((x for x in s._sections.get(doc, ()) if x.anchor == anchor), None)
+        if sec is None:
+            return None
+        try:
+            with self._body_path(s._nodes[doc].path).open("rb") as fh:
+                fh.seek(sec.start)
+                data = fh.read(sec.end - sec.start)
+        except OSError:
+            return None
+        return {
+            "id": node_id,
+            "heading": sec.heading,
+            "anchor": sec.anchor,
+            "byte_start": sec.start,
+            "byte_end": sec.end,
+            "markdown": data.decode("utf-8", errors="replace"),
+        }
+
+    # -- node lookup ----------------------------------------------------------
+
+    def _graph_nodes(self, source: str) -> list[Any]:
+        """Raw node list of one graph file, re-parsed only when the file changes.
+
+        While watching, the watcher evicts changed graphs, so no stat is needed.
+        """
+        path, key = self._kg_files()[source]
+        watching = self._watcher is not None
+        stat = None if watching else _stat(path)
+        with self._lock:
+            cached = self._raw_graphs.get(source)
+            if cached is not None and (watching or cached[0] == stat):
+                self._raw_graphs.move_to_end(source)
+                return cached[1]
+        try:
+            nodes = json.loads(path.read_bytes().decode("utf-8")).get(key, [])
+        except (OSError, UnicodeDecodeError, json.JSONDecodeError, AttributeError):
+            nodes = []
+        with self._lock:
+            self._raw_graphs[source] = (stat, nodes)
+            while len(self._raw_graphs) > max(1, self.raw_graph_cache_size):
+                self._raw_graphs.popitem(last=False)
+        return nodes
+
+    def _raw_node(self, n: IndexedNode) -> dict:
+        """The node's JSON as it appears in its graph file (a fresh copy)."""
+        nodes = self._graph_nodes(n.source)
+        raw = nodes[n.pos] if n.pos < len(nodes) else None
+        if not isinstance(raw, dict) or raw.get("id") != n.id:
+            # File changed since the last rebuild(); fall back to an id lookup.
+            raw = next(
+                (r for r in nodes if isinstance(r, dict) and r.get("id") == n.id),
+                {"id": n.id},
             )
-        return out
+        return copy.deepcopy(raw)
+
+    def _node_payload(self, s: IndexSnapshot, node_id: str) -> dict[str, Any] | None:
+        doc = s._by_id.get(node_id)
+        if doc is None:
+            return None
+        n = s._nodes[doc]
+        return {
+            "id": n.id,
+            "title": n.title,
+            "role": n.role,
+            "track": n.track,
+            "path": n.path,
+            "node": self._raw_node(n),
+            "markdown_body": self._load_body(n),
+        }
+
+    def get_node(self, node_id: str) -> dict[str, Any] | None:
+        return self._node_payload(self.snapshot(), node_id)
+
+    def get_nodes(self, node_ids: Iterable[str]) -> dict[str, dict[str, Any] | None]:
+        """Resolve many ids with a single freshness check.
+
+        Returns ``{node_id: get_node(node_id)}`` in input order (duplicates
+        collapsed); unknown ids map to ``None``.
+        """
+        s = self.snapshot()
+        ids = list(dict.fromkeys(node_ids))
+
+        def source_order(nid: str) -> int:
+            doc = s._by_id.get(nid)
+            return s._nodes[doc].source_code if doc is not None else -1
+
+        # Resolve source by source so each graph file is parsed at most once.
+        payloads = {nid: self._node_payload(s, nid) for nid in sorted(ids, key=source_order)}
+        return {nid: payloads[nid] for nid in ids}
+
+    def source_of(self, node_id: str) -> str | None:
+        """Source graph key (e.g. ``"builder-skills"``) holding ``node_id``."""
+        s = self.snapshot()
+        doc = s._by_id.get(node_id)
+        return s._nodes[doc].source if doc is not None else None
+
+    # -- proposals ------------------------------------------------------------
+
+    @property
+    def proposals(self) -> ProposalIndex:
+        proposals = self._proposals
+        if proposals is None or proposals.proposals_dir != self.proposals_dir:
+            with self._lock:
+                proposals = self._proposals
+                if proposals is None or proposals.proposals_dir != self.proposals_dir:
+                    proposals = self._proposals = ProposalIndex(
+                        self.proposals_dir, file_check_interval=self.body_check_interval
+                    )
+                    self._proposal_views = {}
+                    self._proposal_views_generation = -1
+        return proposals
+
+    def _proposal_view(
+        self, entry: ProposalEntry
+    ) -> tuple[dict[str, Any], dict[str, list[str]]]:
+        """(list_proposals summary, search field tokens) for one proposal, memoized.
+
+        Call with ``self._lock`` held.
+        """
+        cached = self._proposal_views.get(entry.filename)
+        if cached is not None and cached[0] is entry:
+            return cached[1], cached[2]
+        payload = entry.payload if entry.error is None else {"_error": entry.error}
+        data = payload.get("data") or {}
+        summary = {
+            "filename": entry.filename,
+            "slug": entry.slug,
+            "node_id": payload.get("id"),
+            "title": data.get("title") or entry.slug,
+            "description_preview": (data.get("description") or "")[:320],
+            "update_log_filename": self.proposals.log_for(entry.slug),
+        }
+        fields = {
+            "id": _terms(f"{summary['node_id'] or ''} {entry.slug}"),
+            "title": _terms(summary["title"] or ""),
+            "description": _terms(summary["description_preview"]),
+        }
+        self._proposal_views[entry.filename] = (entry, summary, fields)
+        return summary, fields
+
+    def _proposal_snapshot(
+        self, refresh: bool = True
+    ) -> list[tuple[dict[str, Any], dict[str, list[str]]]]:
+        proposals = self.proposals
+        if refresh:
+            self._refresh_proposals()
+        with self._lock:
+            if proposals.generation != self._proposal_views_generation:
+                live = {e.filename for e in proposals.entries()}
+                for name in set(self._proposal_views) - live:
+                    del self._proposal_views[name]
+                # Log matches may have changed even for unchanged proposal files.
+                for entry, summary, _ in self._proposal_views.values():
+                    summary["update_log_filename"] = proposals.log_for(entry.slug)
+                self._proposal_views_generation = proposals.generation
+            return [self._proposal_view(e) for e in proposals.entries()]
+
+    def list_proposals(self) -> list[dict[str, Any]]:
+        return [dict(summary) for summary, _ in self._proposal_snapshot()]
 
 
-# Module-level singleton for MCP server process lifetime.
-_index = KGIndex()
+# Module-level singleton for MCP server process lifetime; warm-starts from disk.
+# The first query still waits for the initial build; later ones never block
+# on a rebuild, they answer from the current snapshot while a worker syncs.
+_index = KGIndex(cache_path=CACHE_DIR / "kg-index.marshal", background_rebuild=True)
 
 
 def get_index() -> KGIndex:
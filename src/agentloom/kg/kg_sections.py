@@ -0,0 +1,131 @@
+"""kg_sections.py — streaming, heading-delimited scan of KG node markdown bodies.
+
+Follows the H1/H2 split of the archived ``chunk_document.parse_markdown_sections``
+(text before the first heading is the preamble), but works on bytes in a
+single streaming pass so ``KGIndex`` can hash, tokenize and section a body
+without holding it in memory. Fenced code blocks are skipped when looking
+for headings, so ``# comment`` lines in shell snippets do not split sections.
+
+Each section carries its byte range in the file, so search hits can point
+agents at a small slice instead of the whole document. The scan also records
+where each token occurs (byte offsets of its first ``MAX_POSITIONS``
+occurrences), which ``kg_snippets`` uses to cut highlighted snippets.
+"""
+from __future__ import annotations
+
+import hashlib
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import BinaryIO, NamedTuple
+
+_CHUNK = 64 * 1024
+_TOKEN_RE = re.compile(rb"[a-z0-9]+")
+_TRAILING_TOKEN_RE = re.compile(rb"[a-z0-9]*\Z")
+_HEADING_RE = re.compile(rb"(#{1,2})[ \t]+(.+?)[ \t#]*\r?\n?\Z")
+_FENCES = (b"```", b"~~~")
+# Occurrences recorded per token and body (see BodyScan.positions).
+MAX_POSITIONS = 16
+
+
+class Section(NamedTuple):
+    heading: str  # heading text without the leading #'s ("" for the preamble)
+    anchor: str  # GitHub-style heading anchor ("" for the preamble)
+    start: int  # byte offset of the heading line (inclusive)
+    end: int  # byte offset where the next section starts (exclusive)
+
+
+@dataclass
+class BodyScan:
+    """Result of streaming one body file."""
+
+    tf: Counter[str] = field(default_factory=Counter)
+    length: int = 0  # bytes indexed (<= the scan's max_bytes)
+    sha1: str = ""  # digest of the whole file, including unindexed bytes
+    sections: tuple[Section, ...] = ()
+    # token -> indices into ``sections`` that contain it (ascending)
+    token_sections: dict[str, tuple[int, ...]] = field(default_factory=dict)
+    # token -> byte offsets of its first MAX_POSITIONS occurrences (ascending)
+    positions: dict[str, tuple[int, ...]] = field(default_factory=dict)
+
+
+def heading_anchor(heading: str, seen: Counter[str] | None = None) -> str:
+    """GitHub-style anchor: lowercase, punctuation dropped, spaces to hyphens.
+
+    Pass the same ``seen`` counter for every heading of a document to get the
+    ``-1``, ``-2`` suffixes GitHub gives repeated headings.
+    """
+    anchor = re.sub(r"[^\w\- ]", "", heading.strip().lower()).replace(" ", "-")
+    if seen is not None:
+        count = seen[anchor]
+        seen[anchor] += 1
+        if count:
+            anchor = f"{anchor}-{count}"
+    return anchor
+
+
+def scan_markdown(fh: BinaryIO, max_bytes: int) -> BodyScan:
+    """Hash all of ``fh``; tokenize and section its first ``max_bytes`` bytes."""
+    digest = hashlib.sha1()
+    tf: Counter[str] = Counter()
+    token_sections: dict[str, list[int]] = {}
+    positions: dict[str, list[int]] = {}
+    sections: list[Section] = []
+    anchors: Counter[str] = Counter()
+    heading, anchor, start = "", "", 0
+    offset = 0
+    carry = b""
+    at_line_start = True
+    in_fence = False
+
+    def add_tokens(buf: bytes, end: int, base: int) -> None:
+        """Tokenize ``buf[:end]``, which starts at byte ``base`` of the file."""
+        current = len(sections)
+        for m in _TOKEN_RE.finditer(buf, 0, end):
+            tok = m.group().decode("ascii")
+            tf[tok] += 1
+            seen = token_sections.setdefault(tok, [])
+            if not seen or seen[-1] != current:
+                seen.append(current)
+            where = positions.setdefault(tok, [])
+            if len(where) < MAX_POSITIONS:
+                where.append(base + m.start())
+
+    def close_section(end: int) -> None:
+        if end > start:
+            sections.append(Section(heading, anchor, start, end))
+
+    for piece in iter(lambda: fh.readline(_CHUNK), b""):
+        digest.update(piece)
+        if offset >= max_bytes:
+            continue
+        part = piece[: max_bytes - offset]
+        if at_line_start:
+            if part.lstrip().startswith(_FENCES):
+                in_fence = not in_fence
+            elif not in_fence and (m := _HEADING_RE.match(part)):
+                if carry:
+                    add_tokens(carry, len(carry), offset - len(carry))
+                    carry = b""
+                close_section(offset)
+                heading = m.group(2).decode("utf-8", errors="replace")
+                anchor = heading_anchor(heading, anchors)
+                start = offset
+        buf = carry + part.lower()
+        # Hold back a trailing partial token until the rest of it arrives.
+        cut = _TRAILING_TOKEN_RE.search(buf).start()
+        add_tokens(buf, cut, offset - len(carry))
+        carry = buf[cut:]
+        at_line_start = piece.endswith(b"\n")
+        offset += len(part)
+    if carry:
+        add_tokens(carry, len(carry), offset - len(carry))
+    close_section(offset)
+    return BodyScan(
+        tf=tf,
+        length=offset,
+        sha1=digest.hexdigest(),
+        sections=tuple(sections),
+        token_sections={tok: tuple(idx) for tok, idx in token_sections.items()},
+        positions={tok: tuple(where) for tok, where in positions.items()},
+    )
@@ -0,0 +1,115 @@
+"""kg_snippets.py — query-highlighted snippets for ``KGIndex`` search hits.
+
+A snippet is a short window of a node's markdown body (or, when the body
+has no match, its description) around the densest cluster of query-term
+matches, with the matches marked. For bodies, ``KGIndex`` locates the
+cluster from the positional postings it records while streaming each body
+(``kg_sections.BodyScan.positions``) and reads only that window's bytes
+from disk; nothing is re-tokenized beyond the window itself.
+
+``densest_window`` picks the cluster; ``highlight`` cuts and marks the text.
+"""
+from __future__ import annotations
+
+import re
+from collections import Counter
+from typing import Any, Sequence
+
+# Target snippet length, in characters (bytes, when windowing a body).
+SNIPPET_CHARS = 240
+_WORD_RE = re.compile(r"[A-Za-z0-9]+")
+_SPACE_RE = re.compile(r"\s+")
+_ELLIPSIS = "…"
+
+
+def densest_window(matches: Sequence[tuple[int, int, str]], width: int) -> tuple[int, int]:
+    """(start, end) spanning the best cluster of ``matches`` fitting in ``width``.
+
+    ``matches`` are ``(start, end, token)`` sorted by start. The best cluster
+    has the most distinct tokens, then the most matches; ties go to the
+    earliest. A single match longer than ``width`` is its own cluster.
+    """
+    best = (-1, -1)
+    span = (matches[0][0], matches[0][1])
+    seen: Counter[str] = Counter()
+    j = 0
+    for i, (start, _, _) in enumerate(matches):
+        while j < len(matches) and (j == i or matches[j][1] - start <= width):
+            seen[matches[j][2]] += 1
+            j += 1
+        score = (len(seen), j - i)
+        if score > best:
+            best, span = score, (start, matches[j - 1][1])
+        tok = matches[i][2]
+        seen[tok] -= 1
+        if not seen[tok]:
+            del seen[tok]
+    return span
+
+
+def highlight(
+    text: str,
+    q_tokens: set[str],
+    field: str,
+    width: int = SNIPPET_CHARS,
+    at_start: bool = True,
+    at_end: bool = True,
+) -> dict[str, Any] | None:
+    """Snippet of ``text`` around its densest cluster of ``q_tokens``, or None.
+
+    Returns ``{"field", "text", "highlights", "highlighted"}``: the window with
+    whitespace collapsed, ``[start, end)`` offsets of each match in it, and
+    the same text with matches wrapped in ``**``. ``at_start``/``at_end`` say
+    whether ``text`` begins/ends where the field does; a cut anywhere else is
+    marked with an ellipsis.
+    """
+    matches = [
+        (m.start(), m.end(), m.group().lower())
+        for m in _WORD_RE.finditer(text)
+        if m.group().lower() in q_tokens
+    ]
+    if not matches:
+        return None
+    lo, hi = densest_window(matches, width)
+    pad = max(0, width - (hi - lo)) // 2
+    lo = max(0, lo - pad)
+    hi = min(len(text), max(hi, lo + width))
+    # Do not start or end in the middle of a word.
+    while 0 < lo < matches[-1][0] and text[lo - 1].isalnum() and text[lo].isalnum():
+        lo += 1
+    while hi < len(text) and hi > lo and text[hi - 1].isalnum() and text[hi].isalnum():
+        hi -= 1
+
+    parts: list[str] = [_ELLIPSIS] if lo > 0 or not at_start else []
+    spans: list[list[int]] = []
+    length = len(parts[0]) if parts else 0
+    pos = lo
+    for start, end, _ in matches:
+        if start < pos or end > hi:
+            continue
+        gap = _SPACE_RE.sub(" ", text[pos:start])
+        if pos == lo:
+            gap = gap.lstrip()
+        parts.append(gap)
+        length += len(gap)
+        spans.append([length, length + end - start])
+        parts.append(text[start:end])
+        length += end - start
+        pos = end
+    tail = _SPACE_RE.sub(" ", text[pos:hi])
+    parts.append(tail.strip() if pos == lo else tail.rstrip())
+    if hi < len(text) or not at_end:
+        parts.append(_ELLIPSIS)
+    out = "".join(parts)
+
+    marked, prev = [], 0
+    for start, end in spans:
+        marked.extend((out[prev:start], "**", out[start:end], "**"))
+        prev = end
+    marked.append(out[prev:])
+    return {
+        "field": field,
+        "text": out,
+        "highlights": spans,
+        "highlighted": "".join(marked),
+    }
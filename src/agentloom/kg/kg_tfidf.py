@@ -0,0 +1,157 @@
+"""kg_tfidf.py — optional sparse TF-IDF matrix over ``KGIndex`` for cosine similarity.
+
+Built from the postings ``KGIndex`` already holds (no re-tokenizing): one
+row per indexed node, one column per term, weighted ``(1 + log tf) * idf``
+with smoothed ``idf = log((1 + N) / (1 + df)) + 1`` and L2-normalised rows.
+Cosine similarity of any batch of queries (or nodes) against the whole
+corpus is then a single sparse product ``Q @ M.T``.
+
+Needs NumPy and SciPy (``pip install agentloom[tfidf]``). They are imported
+lazily, so the rest of the KG tooling works without them; using
+``mode="tfidf"`` or ``KGIndex.similar`` without them raises ``ImportError``.
+"""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Iterable
+
+if TYPE_CHECKING:
+    from agentloom.kg.kg_index import IndexSnapshot
+
+_INSTALL_HINT = (
+    "TF-IDF similarity needs numpy and scipy: pip install 'agentloom[tfidf]'"
+)
+
+
+def _require_numpy() -> tuple[Any, Any]:
+    try:
+        import numpy as np
+        from scipy import sparse
+    except ImportError as exc:
+        raise ImportError(_INSTALL_HINT) from exc
+    return np, sparse
+
+
+@dataclass
+class TfidfMatrix:
+    """Row-normalised TF-IDF document-term matrix for one index generation."""
+
+    generation: int
+    matrix: Any  # scipy.sparse.csr_matrix, shape (docs, terms)
+    docs: Any  # numpy int array: row -> KGIndex doc id
+    rows: dict[int, int]  # doc id -> row
+    columns: dict[str, int]  # term -> column
+    idf: Any  # numpy float array, per column
+
+    @classmethod
+    def build(cls, index: IndexSnapshot) -> TfidfMatrix:
+        np, sparse = _require_numpy()
+        doc_ids = sorted(index._nodes)
+        rows = {doc: i for i, doc in enumerate(doc_ids)}
+        columns: dict[str, int] = {}
+        r: list[int] = []
+        c: list[int] = []
+        tf: list[float] = []
+        df: list[int] = []
+        for term, posting in index._postings.items():
+            columns[term] = len(columns)
+            df.append(len(posting))
+            col = columns[term]
+            for doc, tfs in posting.items():
+                r.append(rows[doc])
+                c.append(col)
+                tf.append(sum(tfs))
+        n_docs = len(doc_ids)
+        idf = np.log((1.0 + n_docs) / (1.0 + np.asarray(df, dtype=np.float64))) + 1.0
+        data = (1.0 + np.log(np.asarray(tf, dtype=np.float64))) * idf[np.asarray(c, dtype=np.int64)]
+        matrix = sparse.csr_matrix(
+            (data, (r, c)), shape=(n_docs, len(columns)), dtype=np.float64
+        )
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        matrix = sparse.csr_matrix(sparse.diags(1.0 / norms) @ matrix)
+        return cls(
+            generation=index.generation,
+            matrix=matrix,
+            docs=np.asarray(doc_ids, dtype=np.int64),
+            rows=rows,
+            columns=columns,
+            idf=idf,
+        )
+
+    def query_matrix(self, token_sets: list[set[str]]) -> Any:
+        """One L2-normalised idf-weighted row per query (binary term presence)."""
+        np, sparse = _require_numpy()
+        r: list[int] = []
+        c: list[int] = []
+        for i, tokens in enumerate(token_sets):
+            for tok in tokens:
+                col = self.columns.get(tok)
+                if col is not None:
+                    r.append(i)
+                    c.append(col)
+        c_arr = np.asarray(c, dtype=np.int64)
+        q = sparse.csr_matrix(
+            (self.idf[c_arr], (r, c_arr)),
+            shape=(len(token_sets), len(self.columns)),
+            dtype=np.float64,
+        )
+        norms = np.sqrt(np.asarray(q.multiply(q).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        return sparse.csr_matrix(sparse.diags(1.0 / norms) @ q)
+
+    def cosine(self, queries: Any) -> list[dict[int, float]]:
+        """Doc id -> cosine similarity (> 0) for each row of ``queries``."""
+        product = (queries @ self.matrix.T).tocsr()
+        out: list[dict[int, float]] = []
+        for i in range(product.shape[0]):
+            lo, hi = product.indptr[i], product.indptr[i + 1]
+            docs = self.docs[product.indices[lo:hi]].tolist()
+            out.append({d: s for d, s in zip(docs, product.data[lo:hi].tolist()) if s > 0})
+        return out
+
+    def score_fields(self, q_tokens: set[str], tokens: Iterable[str]) -> float:
+        """Cosine of a query against a document outside the matrix."""
+        tf: dict[int, int] = {}
+        for tok in tokens:
+            col = self.columns.get(tok)
+            if col is not None:
+                tf[col] = tf.get(col, 0) + 1
+        if not tf:
+            return 0.0
+        weights = {col: (1.0 + math.log(n)) * float(self.idf[col]) for col, n in tf.items()}
+        q_cols = {self.columns[t] for t in q_tokens if t in self.columns}
+        dot = sum(float(self.idf[col]) * weights[col] for col in q_cols if col in weights)
+        if not dot:
+            return 0.0
+        q_norm = math.sqrt(sum(float(self.idf[col]) ** 2 for col in q_cols))
+        d_norm = math.sqrt(sum(w * w for w in weights.values()))
+        return dot / (q_norm * d_norm)
+
+
+class TfidfScorer:
+    """Cosine similarity between the query and each node's TF-IDF vector.
+
+    Fields are pooled (unweighted) into one bag of terms per node. Implements
+    ``score_index_many`` so ``KGIndex.search_many`` scores a whole batch of
+    queries with one sparse matrix product.
+    """
+
+    def score_index(
+        self, index: IndexSnapshot, q_tokens: set[str], query: str
+    ) -> dict[int, float]:
+        [scores] = self.score_index_many(index, [q_tokens])
+        return scores
+
+    def score_index_many(
+        self, index: IndexSnapshot, token_sets: list[set[str]]
+    ) -> list[dict[int, float]]:
+        tfidf = index.tfidf()
+        return tfidf.cosine(tfidf.query_matrix(token_sets))
+
+    def score_fields(
+        self, index: IndexSnapshot, q_tokens: set[str], fields: dict[str, set[str] | list[str]]
+    ) -> float:
+        tokens = [tok for toks in fields.values() for tok in toks]
+        return index.tfidf().score_fields(q_tokens, tokens)
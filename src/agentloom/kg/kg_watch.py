@@ -0,0 +1,331 @@
+"""kg_watch.py — change notifications for KG graphs, markdown bodies and proposals.
+
+``Watcher`` tracks a set of files and directories (directories
+non-recursively: their direct entries) and calls its subscribers with each
+batch of paths that changed, on its own daemon thread. Two backends:
+
+* ``watchdog`` (inotify, FSEvents, ...) when it is installed
+  (``pip install 'agentloom[watch]'``);
+* otherwise a polling loop comparing the (mtime_ns, size) of every watched
+  file and directory entry every ``interval`` seconds.
+
+Either way changes are coalesced: a batch is delivered once ``settle``
+seconds pass without a new change, so a burst (an editor's save dance, a
+``git checkout`` rewriting all graphs) costs subscribers one callback.
+
+One ``Watcher`` can serve several consumers (``KGIndex.start_watching``, the
+dashboard's live-update channel): each registers its paths under its own
+key with ``watch`` and filters the batches it receives.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+logger = logging.getLogger(__name__)
+
+Callback = Callable[[set[Path]], None]
+# watchdog (inotify) events for reads; subscribers re-reading files must not
+# trigger themselves.
+_READ_EVENTS = frozenset({"opened", "closed_no_write"})
+
+
+def _stat(path: Path) -> tuple[int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _have_watchdog() -> bool:
+    try:
+        import watchdog.observers  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+@dataclass
+class Watcher:
+    """Coalescing file/directory watcher; see the module docstring.
+
+    ``use_watchdog=None`` picks watchdog when importable, ``False`` forces
+    polling. Paths are compared as given (callers pass absolute paths).
+    """
+
+    interval: float = 1.0
+    settle: float = 0.2
+    use_watchdog: bool | None = None
+    # key -> (files, directories) registered by one consumer
+    _groups: dict[str, tuple[frozenset[Path], frozenset[Path]]] = field(
+        default_factory=dict, init=False
+    )
+    _subscribers: list[Callback] = field(default_factory=list, init=False)
+    # Last seen (mtime_ns, size) of every watched file and directory entry
+    _stats: dict[Path, tuple[int, int] | None] = field(default_factory=dict, init=False)
+    _pending: set[Path] = field(default_factory=set, init=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    _dirty: threading.Event = field(default_factory=threading.Event, init=False, repr=False)
+    _stop: threading.Event = field(default_factory=threading.Event, init=False, repr=False)
+    _thread: threading.Thread | None = field(default=None, init=False, repr=False)
+    _observer: Any = field(default=None, init=False, repr=False)
+    _handler: Any = field(default=None, init=False, repr=False)
+    # Directory -> its watchdog watch handle
+    _scheduled: dict[Path, Any] = field(default_factory=dict, init=False, repr=False)
+    # Wanted directories that did not exist when last scheduled
+    _missing: set[Path] = field(default_factory=set, init=False, repr=False)
+    _schedule_lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False
+    )
+
+    @property
+    def backend(self) -> str:
+        return "watchdog" if self._observer is not None else "poll"
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    # -- registration -----------------------------------------------------------
+
+    def watch(self, key: str, files: Iterable[Path] = (), dirs: Iterable[Path] = ()) -> None:
+        """Set the files and directories watched for ``key`` (replacing earlier ones).
+
+        Newly watched paths are stat'ed right away, so only changes made after
+        this call are reported.
+        """
+        group = (frozenset(files), frozenset(dirs))
+        with self._lock:
+            self._groups[key] = group
+            fresh = {p: s for p, s in self._scan(group).items() if p not in self._stats}
+            self._stats.update(fresh)
+        if self._observer is not None:
+            self._schedule()
+
+    def unwatch(self, key: str) -> None:
+        with self._lock:
+            self._groups.pop(key, None)
+
+    def subscribe(self, callback: Callback) -> Callable[[], None]:
+        """Call ``callback(changed_paths)`` for every batch; returns an unsubscribe."""
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+
+        return unsubscribe
+
+    # -- lifecycle --------------------------------------------------------------
+
+    def start(self) -> Watcher:
+        """Start the watcher thread (idempotent); returns ``self``."""
+        with self._lock:
+            if self.running:
+                return self
+            self._stop.clear()
+            if self.use_watchdog or (self.use_watchdog is None and _have_watchdog()):
+                self._observer = self._make_observer()
+            self._thread = threading.Thread(
+                target=self._run, name="kg-watcher", daemon=True
+            )
+            self._thread.start()
+        if self._observer is not None:
+            self._schedule()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._dirty.set()
+        thread, observer = self._thread, self._observer
+        if observer is not None:
+            observer.stop()
+            observer.join()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        self._thread = self._observer = None
+        self._scheduled = {}
+        self._missing = set()
+
+    def check(self) -> set[Path]:
+        """Poll every watched path now and deliver any changes synchronously.
+
+        Works with or without the thread running; with watchdog it also
+        catches changes made while events were not being observed.
+        """
+        self._add(self._poll())
+        return self._deliver()
+
+    # -- polling ------------------------------------------------------------------
+
+    @staticmethod
+    def _scan(group: tuple[frozenset[Path], frozenset[Path]]) -> dict[Path, tuple[int, int] | None]:
+        files, dirs = group
+        stats = {p: _stat(p) for p in files}
+        for d in dirs:
+            stats[d] = _stat(d)
+            try:
+                with os.scandir(d) as it:
+                    for de in it:
+                        try:
+                            st = de.stat()
+                        except OSError:
+                            continue
+                        stats[Path(de.path)] = (st.st_mtime_ns, st.st_size)
+            except OSError:
+                continue
+        return stats
+
+    def _poll(self) -> set[Path]:
+        with self._lock:
+            groups = list(self._groups.values())
+        current: dict[Path, tuple[int, int] | None] = {}
+        for group in groups:
+            current.update(self._scan(group))
+        with self._lock:
+            previous, self._stats = self._stats, current
+        # Entries that appeared in or vanished from a directory are changes too.
+        gone = {p for p, s in previous.items() if p not in current and s is not None}
+        return gone | {
+            p for p, s in current.items()
+            if (previous[p] != s if p in previous else s is not None)
+        }
+
+    # -- watchdog -------------------------------------------------------------------
+
+    def _make_observer(self) -> Any:
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+
+        watcher = self
+
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, event: Any) -> None:
+                if event.event_type in _READ_EVENTS:
+                    return
+                paths = {Path(os.fsdecode(event.src_path))}
+                if getattr(event, "dest_path", ""):
+                    paths.add(Path(os.fsdecode(event.dest_path)))
+                watcher._add(paths)
+                if event.is_directory:
+                    # A watched directory may have just appeared (or vanished).
+                    watcher._schedule()
+
+        self._handler = Handler()
+        observer = Observer()
+        observer.daemon = True
+        observer.start()
+        return observer
+
+    def _schedule(self) -> None:
+        """Watch every directory holding (or being) a watched path.
+
+        A directory that does not exist yet is covered by its nearest existing
+        ancestor; the directory event for its creation reschedules, and
+        whatever was written into it before that is reported then.
+        """
+        observer = self._observer
+        if observer is None:
+            return
+        with self._lock:
+            wanted = set()
+            for files, dirs in self._groups.values():
+                wanted.update(p.parent for p in files)
+                wanted.update(dirs)
+        with self._schedule_lock:
+            for d in [d for d in self._scheduled if not d.is_dir()]:
+                try:
+                    observer.unschedule(self._scheduled.pop(d))
+                except (KeyError, OSError):
+                    pass
+            for d in sorted(wanted - self._scheduled.keys()):
+                self._schedule_nearest(observer, d)
+
+    def _schedule_nearest(self, observer: Any, d: Path) -> None:
+        """Watch ``d``, or its nearest existing ancestor if it is missing.
+
+        Call with ``self._schedule_lock`` held.
+        """
+        while True:
+            target = d
+            while not target.is_dir() and target.parent != target:
+                target = target.parent
+            if target != d:
+                self._missing.add(d)
+            if target in self._scheduled:
+                return
+            try:
+                watch = observer.schedule(self._handler, str(target), recursive=False)
+            except OSError:
+                return
+            self._scheduled[target] = watch
+            if target == d:
+                if d in self._missing:
+                    self._missing.discard(d)
+                    appeared = {d}
+                    try:
+                        with os.scandir(d) as it:
+                            appeared.update(Path(de.path) for de in it)
+                    except OSError:
+                        pass
+                    self._add(appeared)
+                return
+            # The next level down may have been created before this watch
+            # was in place (``mkdir -p``); if so, descend instead of waiting.
+            if not (target / d.relative_to(target).parts[0]).is_dir():
+                return
+
+    def _relevant(self, path: Path) -> bool:
+        for files, dirs in self._groups.values():
+            if path in files or path in dirs or path.parent in dirs:
+                return True
+        return False
+
+    # -- delivery -------------------------------------------------------------------
+
+    def _add(self, paths: set[Path]) -> None:
+        if not paths:
+            return
+        with self._lock:
+            paths = {p for p in paths if self._relevant(p)}
+            if not paths:
+                return
+            self._pending |= paths
+        self._dirty.set()
+
+    def _deliver(self) -> set[Path]:
+        with self._lock:
+            batch, self._pending = self._pending, set()
+            subscribers = list(self._subscribers)
+        if batch:
+            for callback in subscribers:
+                try:
+                    callback(set(batch))
+                except Exception:  # noqa: BLE001 - one bad subscriber must not stop the rest
+                    logger.exception("watcher subscriber %r failed", callback)
+        return batch
+
+    def _run(self) -> None:
+        polling = self._observer is None
+        while not self._stop.is_set():
+            if polling:
+                self._stop.wait(self.interval)
+                self._add(self._poll())
+            else:
+                self._dirty.wait()
+            # Coalesce a burst: deliver once nothing new arrived for `settle` s.
+            while self._dirty.is_set() and not self._stop.is_set():
+                self._dirty.clear()
+                self._stop.wait(self.settle)
+                if polling:
+                    self._add(self._poll())
+            if self._stop.is_set():
+                return
+            self._deliver()
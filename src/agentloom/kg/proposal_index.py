@@ -0,0 +1,185 @@
+"""proposal_index.py — slug-keyed index over agents/knowledge-graphs/proposals/.
+
+``propose_node.py`` writes ``<YYYYMMDD-HHMMSS>-<slug>.json`` plus
+``UPDATE_LOG_<YYYYMMDD>_proposal_<slug>.md``; ``accept_proposal.py`` deletes
+the JSON and keeps the log. Matching every proposal to its log by globbing
+the folder per proposal is quadratic, so this index keeps:
+
+* filename -> parsed proposal (re-parsed only when its mtime/size changes),
+* slug -> UPDATE_LOG filename for ``*_proposal_<slug>.md`` logs,
+* every ``UPDATE_LOG_*.md`` with its text, read lazily and cached by mtime/size.
+
+``refresh()`` costs one ``stat()`` of the folder when nothing was added or
+removed (and the last change is a few seconds old); only otherwise is the
+folder listed again, and only new or modified JSON files are re-parsed.
+Rewriting a file in place does not touch the folder mtime, so the known
+files are also stat'ed, at most every ``file_check_interval`` seconds;
+``refresh(full=True)`` (as a watcher reporting a change calls it) rescans
+at once.
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+_PROPOSAL_RE = re.compile(r"^\d{8}-\d{6}-(.+)\.json$")
+_LOG_PREFIX = "UPDATE_LOG_"
+_PROPOSAL_LOG_MARKER = "_proposal_"
+# A folder modified this recently may change again within the same mtime
+# tick; such a stat is not trusted as "clean" (the git racy-timestamp rule).
+_RACY_WINDOW_NS = 2_000_000_000
+
+
+def proposal_slug(filename: str) -> str:
+    """``20260101-120000-my-slug.json`` -> ``my-slug`` (else the file stem)."""
+    m = _PROPOSAL_RE.match(filename)
+    return m.group(1) if m else Path(filename).stem
+
+
+@dataclass(frozen=True)
+class ProposalEntry:
+    filename: str
+    slug: str
+    payload: dict[str, Any]
+    error: str | None  # JSON parse error, if the file could not be read
+    stat: tuple[int, int]  # (mtime_ns, size) the payload was parsed at
+
+
+@dataclass
+class _LogEntry:
+    stat: tuple[int, int]
+    text: str | None = None
+
+
+@dataclass
+class ProposalIndex:
+    proposals_dir: Path
+    # Minimum seconds between stat()s of the known files on the fast path.
+    file_check_interval: float = 2.0
+    # Bumped whenever refresh() observes a change; lets callers cache derived data.
+    generation: int = field(default=0, init=False)
+    _dir_stat: tuple[int, int] | None = field(default=None, init=False)
+    _files_checked_at: float = field(default=0.0, init=False)
+    _entries: dict[str, ProposalEntry] = field(default_factory=dict, init=False)
+    _logs: dict[str, _LogEntry] = field(default_factory=dict, init=False)
+    _log_by_slug: dict[str, str] = field(default_factory=dict, init=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def refresh(self, full: bool = False) -> bool:
+        """Sync with the folder; return True if anything changed."""
+        with self._lock:
+            try:
+                st = os.stat(self.proposals_dir)
+                dir_stat = (st.st_mtime_ns, st.st_size)
+            except OSError:
+                dir_stat = None
+            now = time.monotonic()
+            if not full and dir_stat is not None and dir_stat == self._dir_stat:
+                if now - self._files_checked_at < self.file_check_interval:
+                    return False
+                self._files_checked_at = now
+                if not self._files_changed():
+                    return False
+            self._files_checked_at = now
+            racy = dir_stat is not None and time.time_ns() - dir_stat[0] < _RACY_WINDOW_NS
+            self._dir_stat = None if racy else dir_stat
+            changed = self._rescan() if dir_stat is not None else self._clear()
+            if changed:
+                self.generation += 1
+            return changed
+
+    def _files_changed(self) -> bool:
+        """True if any known proposal or log file was modified or removed."""
+        known = [(name, e.stat) for name, e in self._entries.items()]
+        known += [(name, e.stat) for name, e in self._logs.items()]
+        for name, stat in known:
+            try:
+                st = os.stat(self.proposals_dir / name)
+            except OSError:
+                return True
+            if (st.st_mtime_ns, st.st_size) != stat:
+                return True
+        return False
+
+    def _clear(self) -> bool:
+        changed = bool(self._entries or self._logs)
+        self._entries, self._logs, self._log_by_slug = {}, {}, {}
+        return changed
+
+    def _rescan(self) -> bool:
+        entries: dict[str, ProposalEntry] = {}
+        logs: dict[str, _LogEntry] = {}
+        with os.scandir(self.proposals_dir) as it:
+            for de in it:
+                is_json = de.name.endswith(".json")
+                is_log = de.name.startswith(_LOG_PREFIX) and de.name.endswith(".md")
+                if not (is_json or is_log) or not de.is_file():
+                    continue
+                st = de.stat()
+                stat = (st.st_mtime_ns, st.st_size)
+                if is_json:
+                    prev = self._entries.get(de.name)
+                    entries[de.name] = (
+                        prev if prev is not None and prev.stat == stat
+                        else self._parse(Path(de.path), stat)
+                    )
+                else:
+                    prev_log = self._logs.get(de.name)
+                    logs[de.name] = (
+                        prev_log if prev_log is not None and prev_log.stat == stat
+                        else _LogEntry(stat)
+                    )
+        changed = entries != self._entries or logs.keys() != self._logs.keys() or any(
+            logs[name].stat != self._logs[name].stat for name in logs
+        )
+        log_by_slug: dict[str, str] = {}
+        for name in sorted(logs):
+            if _PROPOSAL_LOG_MARKER in name:
+                slug = name.split(_PROPOSAL_LOG_MARKER, 1)[1][: -len(".md")]
+                log_by_slug.setdefault(slug, name)
+        self._entries = dict(sorted(entries.items()))
+        self._logs = logs
+        self._log_by_slug = log_by_slug
+        return changed
+
+    @staticmethod
+    def _parse(path: Path, stat: tuple[int, int]) -> ProposalEntry:
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+            error = None
+        except (OSError, UnicodeDecodeError, json.JSONDecodeError) as exc:
+            payload, error = {}, str(exc)
+        if not isinstance(payload, dict):
+            payload, error = {}, "proposal payload is not a JSON object"
+        return ProposalEntry(path.name, proposal_slug(path.name), payload, error, stat)
+
+    # -- read API (call refresh() first) ---------------------------------------
+
+    def entries(self) -> list[ProposalEntry]:
+        """Proposals sorted by filename."""
+        return list(self._entries.values())
+
+    def log_for(self, slug: str) -> str | None:
+        """UPDATE_LOG filename ending in ``_proposal_<slug>.md``, if any."""
+        return self._log_by_slug.get(slug)
+
+    def log_names(self) -> list[str]:
+        return list(self._logs)
+
+    def log_text(self, name: str) -> str:
+        """Text of an UPDATE_LOG file, read once per mtime/size."""
+        entry = self._logs.get(name)
+        if entry is None:
+            return ""
+        if entry.text is None:
+            try:
+                entry.text = (self.proposals_dir / name).read_text(encoding="utf-8")
+            except (OSError, UnicodeDecodeError):
+                return ""
+        return entry.text
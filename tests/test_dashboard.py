@@ -0,0 +1,419 @@
+"""Dashboard API behaviour against a throwaway KG folder."""
+import asyncio
+import json
+import os
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("httpx")
+from fastapi.testclient import TestClient  # noqa: E402
+
+from agentloom.dashboard import app as dashboard  # noqa: E402
+from agentloom.dashboard import layout  # noqa: E402
+from agentloom.kg.kg_watch import Watcher  # noqa: E402
+from agentloom.kg.proposal_index import ProposalIndex  # noqa: E402
+
+# Input files are back-dated past the racy-mtime window so stats are trusted.
+_PAST_NS = 1_700_000_000_000_000_000
+
+
+def _write(path, data):
+    path.write_text(json.dumps(data), encoding="utf-8")
+    os.utime(path, ns=(_PAST_NS, _PAST_NS))
+
+
+@pytest.fixture
+def kg_dir(tmp_path, monkeypatch):
+    files = {
+        source: (tmp_path / path.name, key)
+        for source, (path, key) in dashboard.KG_FILES.items()
+    }
+    monkeypatch.setattr(dashboard, "KG_FILES", files)
+    monkeypatch.setattr(dashboard, "MASTER_FILE", tmp_path / "master-graph.json")
+    monkeypatch.setattr(dashboard, "_kg_data_cache", dashboard._KGDataCache())
+    (tmp_path / "proposals").mkdir()
+    monkeypatch.setattr(dashboard, "PROPOSALS_DIR", tmp_path / "proposals")
+    monkeypatch.setattr(dashboard, "_proposal_index", ProposalIndex(tmp_path / "proposals"))
+    _write(files["domain-knowledge"][0], {"nodes": [
+        {"id": "knowledge:domain:a", "data": {"title": "A"}},
+        {"id": "knowledge:domain:b", "data": {"title": "B"}, "links": {"uses": "knowledge:domain:a"}},
+    ]})
+    return tmp_path
+
+
+@pytest.fixture
+def client():
+    return TestClient(dashboard.app)
+
+
+def test_kg_data_is_cached_and_revalidated_with_etag(kg_dir, client, monkeypatch):
+    builds = []
+    build = dashboard._build_kg_data
+    monkeypatch.setattr(dashboard, "_build_kg_data", lambda: builds.append(1) or build())
+
+    first = client.get("/api/kg-data")
+    etag = first.headers["etag"]
+    assert first.status_code == 200 and etag.startswith('"')
+    assert [e["label"] for e in first.json()["edges"]] == ["uses"]
+
+    assert client.get("/api/kg-data", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/api/kg-data", headers={"If-None-Match": f"W/{etag}"}).status_code == 304
+    assert client.get("/api/kg-data").json() == first.json()
+
+    # Touching a file re-hashes it but keeps the payload and the ETag.
+    graph = kg_dir / "domain-knowledge-graph.json"
+    os.utime(graph, ns=(_PAST_NS + 10**9, _PAST_NS + 10**9))
+    assert client.get("/api/kg-data", headers={"If-None-Match": etag}).status_code == 304
+    assert len(builds) == 1
+
+    _write(graph, {"nodes": [{"id": "knowledge:domain:c"}]})
+    changed = client.get("/api/kg-data", headers={"If-None-Match": etag})
+    assert changed.status_code == 200 and changed.headers["etag"] != etag
+    assert [n["id"] for n in changed.json()["nodes"]] == ["knowledge:domain:c"]
+    assert len(builds) == 2
+
+
+def test_kg_data_diff_since_a_revision(kg_dir, client):
+    graph = kg_dir / "domain-knowledge-graph.json"
+    epoch = dashboard._kg_data_cache.epoch
+    first = client.get("/api/kg-data").json()
+    assert first["revision"] == f"{epoch}-1"
+    empty = client.get("/api/kg-data/diff", params={"since": f"{epoch}-1"}).json()
+    assert empty == {
+        "since": f"{epoch}-1", "revision": f"{epoch}-1",
+        "nodes": {"added": [], "removed": [], "changed": []},
+        "edges": {"added": [], "removed": []},
+    }
+
+    _write(graph, {"nodes": [
+        {"id": "knowledge:domain:b", "data": {"title": "B2"}},
+        {"id": "knowledge:domain:c", "links": {"uses": "knowledge:domain:b"}},
+    ]})
+    diff = client.get("/api/kg-data/diff", params={"since": f"{epoch}-1"}).json()
+    assert diff["revision"] == f"{epoch}-2" == client.get("/api/kg-data").json()["revision"]
+    assert [n["id"] for n in diff["nodes"]["added"]] == ["knowledge:domain:c"]
+    assert diff["nodes"]["removed"] == ["knowledge:domain:a"]
+    assert [n["label"] for n in diff["nodes"]["changed"]] == ["B2"]
+    assert diff["edges"] == {
+        "added": [{"source": "knowledge:domain:c", "target": "knowledge:domain:b", "label": "uses"}],
+        "removed": [{"source": "knowledge:domain:b", "target": "knowledge:domain:a", "label": "uses"}],
+    }
+
+    # Rewriting the same elements (different bytes) is not a new revision.
+    graph.write_text(json.dumps(json.loads(graph.read_text()), indent=2), encoding="utf-8")
+    os.utime(graph, ns=(_PAST_NS + 10**9, _PAST_NS + 10**9))
+    assert client.get("/api/kg-data").json()["revision"] == f"{epoch}-2"
+    for since in [f"{epoch}-0", f"{epoch}-3", "1", "garbage", ""]:
+        assert client.get("/api/kg-data/diff", params={"since": since}).status_code == 410
+
+
+def test_kg_data_revisions_from_before_a_restart_are_gone(kg_dir, client, monkeypatch):
+    before = client.get("/api/kg-data").json()["revision"]
+    monkeypatch.setattr(dashboard, "_kg_data_cache", dashboard._KGDataCache())
+    after = client.get("/api/kg-data").json()["revision"]
+    # Both processes count from 1, but the tokens tell them apart.
+    assert before.endswith("-1") and after.endswith("-1") and before != after
+    assert client.get("/api/kg-data/diff", params={"since": before}).status_code == 410
+    assert client.get("/api/kg-data/diff", params={"since": after}).status_code == 200
+
+
+def test_server_side_layout_is_cached_and_stable(kg_dir, client, monkeypatch):
+    pytest.importorskip("numpy")
+    cache_file = kg_dir / "kg-layout.json"
+    monkeypatch.setattr(
+        dashboard, "_kg_data_cache",
+        dashboard._KGDataCache(layout=layout.LayoutCache(cache_file)),
+    )
+    runs = []
+    force_layout = layout.force_layout
+    monkeypatch.setattr(
+        layout, "force_layout", lambda *a, **kw: runs.append(kw["fixed"]) or force_layout(*a, **kw)
+    )
+
+    first = client.get("/api/kg-data").json()
+    positions = first["positions"]
+    assert set(positions) == {"knowledge:domain:a", "knowledge:domain:b"}
+    assert positions["knowledge:domain:a"] != positions["knowledge:domain:b"]
+    assert cache_file.is_file() and len(runs) == 1
+
+    graph = kg_dir / "domain-knowledge-graph.json"
+    _write(graph, {"nodes": [
+        {"id": "knowledge:domain:a", "data": {"title": "A"}},
+        {"id": "knowledge:domain:b", "data": {"title": "B"}, "links": {"uses": "knowledge:domain:a"}},
+        {"id": "knowledge:domain:c", "parent": "knowledge:domain:b"},
+    ]})
+    since = f"{dashboard._kg_data_cache.epoch}-1"
+    diff = client.get("/api/kg-data/diff", params={"since": since}).json()
+    assert list(diff["positions"]) == ["knowledge:domain:c"]
+    second = client.get("/api/kg-data").json()["positions"]
+    # Existing nodes were pinned; only the new one was placed.
+    assert {k: list(xy) for k, xy in runs[-1].items()} == positions
+    assert {k: second[k] for k in positions} == positions
+    assert second["knowledge:domain:c"] == diff["positions"]["knowledge:domain:c"]
+
+    # A restarted dashboard reuses the persisted layout for the same graph.
+    monkeypatch.setattr(
+        dashboard, "_kg_data_cache",
+        dashboard._KGDataCache(layout=layout.LayoutCache(cache_file)),
+    )
+    assert client.get("/api/kg-data").json()["positions"] == second
+    assert len(runs) == 2
+
+
+def test_layout_runs_without_blocking_other_requests(kg_dir, client, monkeypatch):
+    monkeypatch.setattr(
+        dashboard, "_kg_data_cache", dashboard._KGDataCache(layout=layout.LayoutCache())
+    )
+    started, release = threading.Event(), threading.Event()
+
+    def slow_layout(_, elements):
+        started.set()
+        assert release.wait(5)
+        return {nid: (0.0, 0.0) for nid in elements[0]}
+
+    monkeypatch.setattr(dashboard, "_layout", slow_layout)
+    laid_out = []
+    worker = threading.Thread(target=lambda: laid_out.append(dashboard._kg_data_cache.get()))
+    worker.start()
+    try:
+        assert started.wait(5)
+        # Served at once, without positions, while the layout is running.
+        assert "positions" not in client.get("/api/kg-data").json()
+        assert client.get("/api/kg-subgraph", params={"root": "knowledge:domain:a"}).status_code == 200
+    finally:
+        release.set()
+        worker.join()
+    assert "positions" in json.loads(laid_out[0][0])
+    assert client.get("/api/kg-data").json()["positions"]["knowledge:domain:a"] == [0.0, 0.0]
+
+
+def test_revision_first_seen_by_derived_is_still_laid_out(kg_dir, client, monkeypatch):
+    monkeypatch.setattr(
+        dashboard, "_kg_data_cache", dashboard._KGDataCache(layout=layout.LayoutCache())
+    )
+    monkeypatch.setattr(
+        dashboard, "_layout", lambda _, elements: {nid: (1.0, 2.0) for nid in elements[0]}
+    )
+    assert client.get("/api/kg-subgraph", params={"root": "knowledge:domain:a"}).status_code == 200
+    for _ in range(2):
+        assert client.get("/api/kg-data").json()["positions"]["knowledge:domain:a"] == [1.0, 2.0]
+
+
+def test_graph_events_do_not_wait_for_the_layout(kg_dir, monkeypatch):
+    monkeypatch.setattr(
+        dashboard, "_kg_data_cache", dashboard._KGDataCache(layout=layout.LayoutCache())
+    )
+    release = threading.Event()
+
+    def slow_layout(_, elements):
+        assert release.wait(5)
+        return {nid: (0.0, 0.0) for nid in elements[0]}
+
+    monkeypatch.setattr(dashboard, "_layout", slow_layout)
+    hub = dashboard._EventHub(Watcher(interval=3600, use_watchdog=False))
+
+    async def scenario():
+        stream = hub.stream()
+        await anext(stream)
+        _write(kg_dir / "domain-knowledge-graph.json", {"nodes": []})
+        hub.watcher.check()
+        event = await asyncio.wait_for(anext(stream), timeout=5)
+        await stream.aclose()
+        return event
+
+    try:
+        event = asyncio.run(scenario())
+        assert event.startswith("id: 1\nevent: graph\n")
+        assert "positions" not in json.loads(dashboard._kg_data_cache.current[2])
+    finally:
+        release.set()
+        hub.stop()
+    deadline = time.monotonic() + 5
+    while dashboard._kg_data_cache._unplaced is not None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert "positions" in json.loads(dashboard._kg_data_cache.get()[0])
+
+
+def test_kg_subgraph_neighbourhood_within_budget(kg_dir, client, monkeypatch):
+    _write(kg_dir / "domain-knowledge-graph.json", {"nodes": [
+        {"id": "k:a"},
+        {"id": "k:b", "parent": "k:a"},
+        {"id": "k:c", "parent": "k:b", "links": {"see": "k:a"}},
+        {"id": "k:d", "parent": "k:c"},
+        {"id": "k:e", "links": {"see": "k:b"}},
+    ]})
+    builds = []
+    adjacency = dashboard._adjacency
+    monkeypatch.setattr(dashboard, "_adjacency", lambda el: builds.append(1) or adjacency(el))
+
+    def ids(**params):
+        body = client.get("/api/kg-subgraph", params=params).json()
+        return {n["id"]: n["hops"] for n in body["nodes"]}, body
+
+    hops, body = ids(root="k:b")
+    assert hops == {"k:b": 0, "k:a": 1, "k:c": 1, "k:e": 1}
+    assert {(e["source"], e["target"]) for e in body["edges"]} == {
+        ("k:a", "k:b"), ("k:b", "k:c"), ("k:c", "k:a"), ("k:e", "k:b")
+    }
+    assert not body["truncated"] and body["revision"].endswith("-1")
+
+    hops, body = ids(root="k:d", depth=3, edge_labels="child")
+    assert hops == {"k:d": 0, "k:c": 1, "k:b": 2, "k:a": 3}
+    assert {e["label"] for e in body["edges"]} == {"child"}
+
+    hops, body = ids(root="k:b", depth=5, max_nodes=3)
+    assert len(hops) == 3 and body["truncated"]
+    assert set(hops.values()) == {0, 1}
+
+    assert client.get("/api/kg-subgraph", params={"root": "k:zz"}).status_code == 404
+    assert len(builds) == 1
+
+
+def test_kg_clusters_collapse_and_expand_on_demand(kg_dir, client, monkeypatch):
+    _write(kg_dir / "domain-knowledge-graph.json", {"nodes": [
+        {"id": "k:root", "category": "meta"},
+        {"id": "k:a", "parent": "k:root", "category": "meta"},
+        {"id": "k:a1", "parent": "k:a", "category": "tools", "links": {"see": "k:b"}},
+        {"id": "k:a2", "parent": "k:a", "category": "tools", "links": {"see": "k:b"}},
+        {"id": "k:b", "parent": "k:root"},
+    ]})
+    builds = []
+    build = dashboard.Clustering.build
+    monkeypatch.setattr(
+        dashboard.Clustering, "build", lambda *a: builds.append(a[-1]) or build(*a)
+    )
+
+    def view(by, *expand):
+        body = client.get("/api/kg-clusters", params={"by": by, "expand": list(expand)}).json()
+        nodes = {n["id"]: n.get("count") for n in body["nodes"]}
+        edges = {(e["source"], e["target"], e["label"]): e["count"] for e in body["edges"]}
+        return nodes, edges, body["expanded"]
+
+    assert view("parent") == ({"parent:k:root": 5}, {}, [])
+    nodes, edges, _ = view("parent", "parent:k:root")
+    assert nodes == {"k:root": None, "parent:k:a": 3, "k:b": None}
+    assert edges == {
+        ("k:root", "parent:k:a", "child"): 1,
+        ("k:root", "k:b", "child"): 1,
+        ("parent:k:a", "k:b", "see"): 2,
+    }
+    # Opening a nested cluster opens its parents; stale ids are ignored.
+    nodes, edges, expanded = view("parent", "parent:k:a", "parent:k:gone")
+    assert expanded == ["parent:k:a", "parent:k:root"]
+    assert set(nodes) == {"k:root", "k:a", "k:a1", "k:a2", "k:b"}
+    assert edges[("k:a1", "k:b", "see")] == 1
+
+    nodes, _, _ = view("source", "source:domain-knowledge")
+    assert nodes == {
+        "category:domain-knowledge/meta": 2, "category:domain-knowledge/tools": 2, "k:b": None
+    }
+    nodes, edges, _ = view("category")
+    assert nodes == {"category:meta": 2, "category:tools": 2, "k:b": None}
+    assert edges == {
+        ("category:meta", "category:tools", "child"): 2,
+        ("category:meta", "k:b", "child"): 1,
+        ("category:tools", "k:b", "see"): 2,
+    }
+    assert client.get("/api/kg-clusters", params={"by": "colour"}).status_code == 422
+    assert builds == ["parent", "source", "category"]
+
+
+def test_kg_clusters_are_placed_from_the_server_layout(kg_dir, client, monkeypatch):
+    monkeypatch.setattr(
+        dashboard, "_kg_data_cache", dashboard._KGDataCache(layout=layout.LayoutCache())
+    )
+    placed = {"knowledge:domain:a": (0.0, 10.0), "knowledge:domain:b": (4.0, 20.0)}
+    monkeypatch.setattr(dashboard, "_layout", lambda _, elements: placed)
+
+    # The cluster view alone (as the UI uses for large graphs) lays the graph out.
+    body = client.get("/api/kg-clusters", params={"by": "source"}).json()
+    assert body["positions"] == {"source:domain-knowledge": [2.0, 15.0]}
+    body = client.get(
+        "/api/kg-clusters", params={"by": "source", "expand": "source:domain-knowledge"}
+    ).json()
+    assert body["positions"] == {nid: list(xy) for nid, xy in placed.items()}
+
+
+def test_events_stream_small_change_notifications(kg_dir):
+    proposals = kg_dir / "proposals"
+    (proposals / "20260101-120000-old.json").write_text("{}", encoding="utf-8")
+    hub = dashboard._EventHub(Watcher(interval=3600, use_watchdog=False))
+
+    async def scenario():
+        stream = hub.stream()
+        assert await anext(stream) == "retry: 3000\n\n"
+        _write(kg_dir / "domain-knowledge-graph.json", {"nodes": []})
+        (proposals / "20260101-120000-old.json").unlink()
+        (proposals / "20260102-090000-new.json").write_text("{}", encoding="utf-8")
+        (proposals / "UPDATE_LOG_20260102_proposal_new.md").write_text("# new", encoding="utf-8")
+        hub.watcher.check()
+        chunks = [await anext(stream) for _ in range(4)]
+        await stream.aclose()
+
+        resumed = hub.stream(last_event_id="2")
+        await anext(resumed)
+        backlog = [await anext(resumed), await anext(resumed)]
+        await resumed.aclose()
+
+        stale = hub.stream(last_event_id="99")
+        await anext(stale)
+        resync = await anext(stale)
+        await stale.aclose()
+        return chunks, backlog, resync
+
+    try:
+        chunks, backlog, resync = asyncio.run(scenario())
+    finally:
+        hub.stop()
+
+    assert chunks == [
+        'id: 1\nevent: graph\ndata: {"source": "domain-knowledge"}\n\n',
+        'id: 2\nevent: proposal\ndata: {"action": "removed", '
+        '"filename": "20260101-120000-old.json", "slug": "old"}\n\n',
+        'id: 3\nevent: proposal\ndata: {"action": "added", '
+        '"filename": "20260102-090000-new.json", "slug": "new"}\n\n',
+        'id: 4\nevent: timeline\ndata: {"filename": "UPDATE_LOG_20260102_proposal_new.md"}\n\n',
+    ]
+    assert backlog == chunks[2:]
+    assert resync.startswith("id: 4\nevent: resync\n")
+    assert not hub._clients
+    # The shared caches were refreshed once for every listener.
+    assert [e.slug for e in dashboard._proposal_index.entries()] == ["new"]
+    assert json.loads(dashboard._kg_data_cache.current[2])["nodes"] == []
+
+
+@pytest.mark.parametrize("use_watchdog", [True, False])
+def test_events_stream_sees_a_proposals_folder_created_after_start(kg_dir, use_watchdog):
+    if use_watchdog:
+        pytest.importorskip("watchdog")
+    proposals = kg_dir / "proposals"
+    proposals.rmdir()
+    hub = dashboard._EventHub(Watcher(interval=0.05, settle=0.05, use_watchdog=use_watchdog))
+
+    async def scenario():
+        stream = hub.stream()
+        assert await anext(stream) == "retry: 3000\n\n"
+        proposals.mkdir()
+        (proposals / "20260102-090000-new.json").write_text("{}", encoding="utf-8")
+        added = await asyncio.wait_for(anext(stream), timeout=5)
+        await stream.aclose()
+        return added
+
+    try:
+        added = asyncio.run(scenario())
+    finally:
+        hub.stop()
+
+    assert added == (
+        'id: 1\nevent: proposal\ndata: {"action": "added", '
+        '"filename": "20260102-090000-new.json", "slug": "new"}\n\n'
+    )
+    assert [e.slug for e in dashboard._proposal_index.entries()] == ["new"]
+    # A batch holding only the folder itself is a rescan of its listing.
+    (proposals / "20260102-090000-new.json").unlink()
+    proposals.rmdir()
+    assert hub._classify({proposals}) == [("proposal", {
+        "action": "removed", "filename": "20260102-090000-new.json", "slug": "new",
+    })]
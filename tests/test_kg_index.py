@@ -0,0 +1,659 @@
+"""KGIndex search behaviour against the repository's own knowledge graphs."""
+import json
+import marshal
+import os
+import threading
+import time
+
+import pytest
+
+from agentloom.kg import bench_memory, kg_index
+from agentloom.kg.kg_centrality import pagerank
+from agentloom.kg.kg_index import KGIndex, _query_tokens, _terms, _tokenize
+from agentloom.kg.kg_scoring import FIELDS, BM25FScorer
+from agentloom.kg.kg_snippets import SNIPPET_CHARS, densest_window
+from agentloom.kg.kg_watch import Watcher
+from agentloom.kg.proposal_index import ProposalIndex
+
+QUERIES = [
+    "propose review protocol",
+    "validator tier",
+    "knowledge:builder:root",
+    "catalog ui story",
+]
+
+
+@pytest.fixture(scope="module")
+def index():
+    ix = KGIndex()
+    ix.rebuild(force=True)
+    return ix
+
+
+def _brute_force_ids(ix, query):
+    """Reference ranking: re-tokenize every node blob (the pre-index algorithm)."""
+    q_tokens = _query_tokens(query)
+    scored = []
+    for n in ix.snapshot()._nodes.values():
+        blob = " ".join([n.id, n.title, n.description, ix._load_body(n)])
+        shared = q_tokens & _tokenize(blob)
+        if shared:
+            score = len(shared) / len(q_tokens)
+            if n.id.lower() in query.lower():
+                score += 0.5
+            scored.append((score, n.id))
+    scored.sort(key=lambda x: (-x[0], x[1]))
+    return [(nid, round(score, 3)) for score, nid in scored]
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_inverted_index_matches_brute_force(index, query):
+    got = [(r["id"], r["score"]) for r in index.search(query, limit=50)]
+    assert got == _brute_force_ids(index, query)[:50]
+
+
+def test_postings_carry_field_term_frequencies(index):
+    s = index.snapshot()
+    for doc, n in s._nodes.items():
+        id_len = s._field_lengths[doc][FIELDS.index("id")]
+        assert id_len == len(_terms(n.id))
+        assert s._postings[n.id.split(":")[0]][doc][FIELDS.index("id")] >= 1
+
+
+def test_bm25f_breaks_overlap_ties(index):
+    overlap = index.search("propose review protocol", limit=10)
+    bm25f = index.search("propose review protocol", limit=10, mode="bm25f")
+    assert overlap[0]["score"] == overlap[1]["score"]
+    assert bm25f[0]["id"] == "knowledge:builder:propose-review-protocol"
+    assert bm25f[0]["score"] > bm25f[1]["score"]
+
+
+def test_bm25f_field_weights_are_tunable():
+    ix = KGIndex(scorers={"bm25f": BM25FScorer(weights={"body": 1.0})})
+    hits = ix.search("propose review protocol", limit=3, mode="bm25f")
+    assert hits and all(r["score"] > 0 for r in hits)
+    with pytest.raises(ValueError):
+        ix.search("propose", mode="overlap")
+
+
+def _write_graph(root, name, key, nodes):
+    kg_dir = root / "agents" / "knowledge-graphs"
+    kg_dir.mkdir(parents=True, exist_ok=True)
+    # Write-then-rename, so a concurrent rebuild never reads a partial file.
+    tmp = kg_dir / f"{name}.tmp"
+    tmp.write_text(json.dumps({key: nodes}), encoding="utf-8")
+    tmp.replace(kg_dir / name)
+
+
+@pytest.fixture
+def tiny_repo(tmp_path):
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "alpha.md").write_text("# Alpha\nzebra stripes\n", encoding="utf-8")
+    _write_graph(tmp_path, "builder-knowledge-graph.json", "nodes", [
+        {"id": "knowledge:builder:alpha", "data": {"title": "Alpha", "path": "docs/alpha.md"}},
+    ])
+    _write_graph(tmp_path, "domain-knowledge-graph.json", "nodes", [
+        {"id": "knowledge:domain:beta", "data": {"title": "Beta"}},
+    ])
+    return tmp_path
+
+
+def test_rebuild_reindexes_only_changed_sources(tiny_repo):
+    ix = KGIndex(repo_root=tiny_repo, body_check_interval=0.0)
+    assert ix.rebuild() == 2
+    assert ix.rebuild() == 0
+
+    _write_graph(tiny_repo, "domain-knowledge-graph.json", "nodes", [
+        {"id": "knowledge:domain:beta", "data": {"title": "Beta"}},
+        {"id": "knowledge:domain:gamma", "data": {"title": "Gamma giraffe"}},
+    ])
+    assert ix.rebuild() == 1
+    assert [r["id"] for r in ix.search("giraffe")] == ["knowledge:domain:gamma"]
+
+    (tiny_repo / "docs" / "alpha.md").write_text("# Alpha\nokapi only\n", encoding="utf-8")
+    assert ix.rebuild() == 1
+    assert ix.search("zebra") == []
+    assert [r["id"] for r in ix.search("okapi")] == ["knowledge:builder:alpha"]
+
+
+def test_get_nodes_resolves_ids_in_one_call(index):
+    ids = ["skill:builder:propose-node", "nope", "knowledge:builder:root"]
+    got = index.get_nodes(ids)
+    assert list(got) == ids
+    assert got["nope"] is None
+    assert got["skill:builder:propose-node"] == index.get_node("skill:builder:propose-node")
+    assert index.source_of("knowledge:builder:root") == "builder-knowledge"
+
+
+def test_warm_start_from_cache_reindexes_only_changes(tiny_repo):
+    cache = tiny_repo / ".agentloom" / "cache" / "kg-index.marshal"
+    cold = KGIndex(repo_root=tiny_repo, cache_path=cache)
+    assert cold.rebuild() == 2 and cache.is_file()
+
+    written = cache.stat().st_mtime_ns
+    os.utime(cache, ns=(written - 10**9, written - 10**9))
+    warm = KGIndex(repo_root=tiny_repo, cache_path=cache)
+    assert warm.rebuild() == 0
+    # An unchanged cache is loaded, not rewritten.
+    assert cache.stat().st_mtime_ns == written - 10**9
+    assert [r["id"] for r in warm.search("zebra")] == ["knowledge:builder:alpha"]
+
+    _write_graph(tiny_repo, "domain-knowledge-graph.json", "nodes", [
+        {"id": "knowledge:domain:delta", "data": {"title": "Delta"}},
+    ])
+    assert KGIndex(repo_root=tiny_repo, cache_path=cache).rebuild() == 2
+
+
+@pytest.mark.parametrize("content", [
+    b"not a cache",
+    b"\x80\x04K\x01.",  # a pickle
+    marshal.dumps({"key": None}),
+])
+def test_unusable_cache_files_fall_back_to_a_full_build(tiny_repo, content):
+    cache = tiny_repo / ".agentloom" / "cache" / "kg-index.marshal"
+    cache.parent.mkdir(parents=True)
+    cache.write_bytes(content)
+    ix = KGIndex(repo_root=tiny_repo, cache_path=cache)
+    assert [r["id"] for r in ix.search("zebra")] == ["knowledge:builder:alpha"]
+
+
+def test_malformed_cache_state_falls_back_to_a_full_build(tiny_repo):
+    cache = tiny_repo / ".agentloom" / "cache" / "kg-index.marshal"
+    KGIndex(repo_root=tiny_repo, cache_path=cache).rebuild()
+    payload = marshal.loads(cache.read_bytes())
+    payload["state"]["_nodes"] = {0: 5}
+    cache.write_bytes(marshal.dumps(payload))
+    assert KGIndex(repo_root=tiny_repo, cache_path=cache).rebuild() == 2
+
+
+def test_bodies_are_loaded_lazily_and_capped(tiny_repo):
+    body = "# Alpha\n" + "filler " * 100 + "needle\n"
+    (tiny_repo / "docs" / "alpha.md").write_text(body, encoding="utf-8")
+    ix = KGIndex(repo_root=tiny_repo, max_body_bytes=64)
+    ix.rebuild()
+    assert ix.search("needle") == []
+    assert [r["id"] for r in ix.search("filler")] == ["knowledge:builder:alpha"]
+    assert ix.get_node("knowledge:builder:alpha")["markdown_body"] == body
+
+
+def test_hits_point_at_matching_section(tiny_repo):
+    body = (
+        "intro text\n"
+        "# Alpha\nzebra\n"
+        "```bash\n# not a heading\n```\n"
+        "## Details & Notes\nquagga stripes\n"
+    )
+    (tiny_repo / "docs" / "alpha.md").write_text(body, encoding="utf-8")
+    ix = KGIndex(repo_root=tiny_repo)
+    [hit] = ix.search("quagga")
+    section = hit["section"]
+    assert section["anchor"] == "details--notes"
+    assert body.encode()[section["byte_start"]:section["byte_end"]].startswith(b"## Details")
+    got = ix.get_section(hit["id"], section["anchor"])
+    assert got["markdown"] == "## Details & Notes\nquagga stripes\n"
+    assert ix.get_section(hit["id"], "")["markdown"] == "intro text\n"
+    assert "# not a heading" in ix.get_section(hit["id"], "alpha")["markdown"]
+
+
+def test_proposal_index_matches_logs_and_tracks_changes(tiny_repo):
+    proposals = tiny_repo / "agents" / "knowledge-graphs" / "proposals"
+    proposals.mkdir()
+    node = {"id": "knowledge:domain:ocelot", "data": {"title": "Ocelot spots"}}
+    (proposals / "20260101-120000-ocelot.json").write_text(json.dumps(node), encoding="utf-8")
+    (proposals / "UPDATE_LOG_20260101_proposal_ocelot.md").write_text("# log\n", encoding="utf-8")
+    ix = KGIndex(repo_root=tiny_repo)
+
+    [p] = ix.list_proposals()
+    assert p["slug"] == "ocelot"
+    assert p["update_log_filename"] == "UPDATE_LOG_20260101_proposal_ocelot.md"
+    [hit] = ix.search("ocelot")
+    assert hit["status"] == "pending_proposal"
+
+    generation = ix.proposals.generation
+    ix.list_proposals()
+    assert ix.proposals.generation == generation
+
+    (proposals / "20260101-120000-ocelot.json").unlink()
+    assert ix.list_proposals() == []
+    assert ix.proposals.generation == generation + 1
+
+
+def test_proposal_index_sees_files_rewritten_in_place(tmp_path):
+    path = tmp_path / "20260101-120000-ocelot.json"
+    path.write_text(json.dumps({"id": "a"}), encoding="utf-8")
+    old = time.time_ns() - 10_000_000_000
+    os.utime(path, ns=(old, old))
+    os.utime(tmp_path, ns=(old, old))
+    proposals = ProposalIndex(tmp_path, file_check_interval=3600)
+    assert proposals.refresh()
+    assert not proposals.refresh()
+
+    # Same size, new mtime; the folder's own stat does not change.
+    path.write_text(json.dumps({"id": "b"}), encoding="utf-8")
+    os.utime(tmp_path, ns=(old, old))
+    # Known files are only re-stat'ed every file_check_interval seconds...
+    assert not proposals.refresh()
+    proposals.file_check_interval = 0.0
+    assert proposals.refresh()
+    assert [e.payload["id"] for e in proposals.entries()] == ["b"]
+    assert not proposals.refresh()
+
+    # ... while a full refresh (a watcher saw a change) rescans at once.
+    proposals.file_check_interval = 3600
+    path.write_text(json.dumps({"id": "c"}), encoding="utf-8")
+    os.utime(tmp_path, ns=(old, old))
+    assert proposals.refresh(full=True)
+    assert [e.payload["id"] for e in proposals.entries()] == ["c"]
+
+
+def test_result_cache_hits_until_corpus_changes(tiny_repo):
+    ix = KGIndex(repo_root=tiny_repo)
+    first = ix.search("Zebra  stripes")
+    first[0]["title"] = "mutated by caller"
+    assert ix.search("zebra stripes")[0]["title"] == "Alpha"
+    assert ix.cache_info()["hits"] == 1 and ix.cache_info()["misses"] == 1
+
+    generation = ix.generation
+    _write_graph(tiny_repo, "domain-knowledge-graph.json", "nodes", [
+        {"id": "knowledge:domain:zebra", "data": {"title": "Zebra"}},
+    ])
+    assert len(ix.search("zebra stripes")) == 2
+    assert ix.generation == generation + 1
+    assert ix.cache_info()["misses"] == 2
+
+
+def test_results_scored_against_old_proposals_are_not_cached_as_new(tiny_repo, monkeypatch):
+    proposals = tiny_repo / "agents" / "knowledge-graphs" / "proposals"
+    proposals.mkdir()
+    ix = KGIndex(repo_root=tiny_repo)
+    score = ix._score_proposals
+
+    def score_then_propose(*args):
+        hits = score(*args)
+        if not (proposals / "20260101-120000-ocelot.json").exists():
+            # A proposal lands, and another caller looks up, mid-search.
+            node = {"id": "knowledge:domain:ocelot", "data": {"title": "Ocelot"}}
+            (proposals / "20260101-120000-ocelot.json").write_text(json.dumps(node))
+            ix.proposals.refresh(full=True)
+            ix.search("unrelated")
+        return hits
+
+    monkeypatch.setattr(ix, "_score_proposals", score_then_propose)
+    assert ix.search("ocelot") == []
+    assert [r["id"] for r in ix.search("ocelot")] == ["knowledge:domain:ocelot"]
+
+
+def test_search_many_matches_single_searches_in_order(index, monkeypatch):
+    queries = ["validator tier", "", "propose review protocol", "validator tier"]
+    expected = [index.search(q, mode="bm25f") for q in queries]
+    calls = []
+    rebuild = index.rebuild
+    monkeypatch.setattr(index, "rebuild", lambda *a, **kw: calls.append(1) or rebuild(*a, **kw))
+    assert index.search_many(queries, mode="bm25f") == expected
+    assert len(calls) == 1
+
+
+def test_autocomplete_and_fuzzy_search_tolerate_typos(tiny_repo):
+    ix = KGIndex(repo_root=tiny_repo)
+    assert [r["id"] for r in ix.autocomplete("knowledge:domain")] == ["knowledge:domain:beta"]
+    assert [r["id"] for r in ix.autocomplete("alp")] == ["knowledge:builder:alpha"]
+    assert [r["id"] for r in ix.autocomplete("alhpa")] == ["knowledge:builder:alpha"]
+    assert ix.autocomplete("") == []
+    assert ix.search("zebar") == []
+    assert [r["id"] for r in ix.search("zebar", fuzzy=True)] == ["knowledge:builder:alpha"]
+    assert [r["id"] for r in ix.search("strip", fuzzy=True)] == ["knowledge:builder:alpha"]
+
+
+def test_tfidf_similar_and_batched_search(tiny_repo):
+    pytest.importorskip("scipy")
+    _write_graph(tiny_repo, "domain-knowledge-graph.json", "nodes", [
+        {"id": "knowledge:domain:beta", "data": {"title": "Zebra herds", "description": "stripes"}},
+        {"id": "knowledge:domain:gamma", "data": {"title": "Gamma giraffe"}},
+    ])
+    ix = KGIndex(repo_root=tiny_repo)
+    similar = ix.similar("knowledge:builder:alpha", k=5)
+    assert [r["id"] for r in similar] == ["knowledge:domain:beta", "knowledge:domain:gamma"]
+    assert 1 > similar[0]["score"] > similar[1]["score"] > 0
+    assert ix.similar("nope") == []
+
+    queries = ["zebra stripes", "giraffe", "zebra stripes"]
+    batch = ix.search_many(queries, mode="tfidf")
+    assert [r["id"] for r in batch[1]] == ["knowledge:domain:gamma"]
+    assert batch[0] == batch[2] and len(batch[0]) == 2
+    ix.clear_result_cache()
+    assert batch == [ix.search(q, mode="tfidf") for q in queries]
+
+
+def test_centrality_prior_breaks_ties_and_warm_starts(tiny_repo):
+    _write_graph(tiny_repo, "domain-knowledge-graph.json", "nodes", [
+        {"id": "knowledge:domain:beta", "data": {"title": "Beta zebra"}},
+        {"id": "knowledge:domain:hub", "data": {"title": "Hub zebra"}},
+        {"id": "knowledge:domain:leaf", "relationships": {"parent": "knowledge:domain:hub"},
+         "links": {"related": ["knowledge:domain:hub", "knowledge:domain:missing"]}},
+    ])
+    ix = KGIndex(repo_root=tiny_repo)
+    ranks = ix.centrality()
+    assert max(ranks, key=ranks.get) == "knowledge:domain:hub"
+    assert abs(sum(ranks.values()) - 1.0) < 1e-6
+
+    plain = ix.search("zebra", limit=3)
+    assert plain[1]["score"] == plain[2]["score"]
+    boosted = ix.search("zebra", limit=3, boost=1.0)
+    assert boosted[0]["id"] == "knowledge:domain:hub"
+    assert boosted[0]["score"] > plain[0]["score"]
+
+    nodes = ["hub"] + [f"n{i}" for i in range(30)]
+    links = [(f"n{i}", "hub") for i in range(30)] + [("hub", "n0"), ("n1", "n2")]
+    cold, _ = pagerank(nodes, links)
+    warm, warm_iters = pagerank(nodes + ["x"], links + [("x", "n5")], start=cold)
+    fresh, fresh_iters = pagerank(nodes + ["x"], links + [("x", "n5")])
+    assert warm_iters < fresh_iters
+    assert all(abs(warm[k] - fresh[k]) < 1e-6 for k in fresh)
+
+
+def test_search_faceted_counts_every_bucket_in_one_pass(tiny_repo):
+    _write_graph(tiny_repo, "builder-skills-graph.json", "skills", [
+        {"id": "skill:builder:zebra-tool", "type": "skill", "category": "kg-tools",
+         "name": "Zebra tool"},
+    ])
+    proposals = tiny_repo / "agents" / "knowledge-graphs" / "proposals"
+    proposals.mkdir()
+    node = {"id": "knowledge:domain:zebra", "type": "concept", "data": {"title": "Zebra"}}
+    (proposals / "20260101-120000-zebra.json").write_text(json.dumps(node), encoding="utf-8")
+    ix = KGIndex(repo_root=tiny_repo)
+
+    got = ix.search_faceted("zebra", limit=1)
+    assert got["results"] == ix.search("zebra", limit=1)
+    assert got["facets"] == {
+        "role": {"builder": 2, "domain": 1},
+        "track": {"knowledge": 2, "skills": 1},
+        "type": {"skill": 1, "concept": 1},
+        "category": {"kg-tools": 1},
+        "status": {"accepted": 2, "pending_proposal": 1},
+    }
+    facets = ix.search_faceted("zebra", role="builder", track="skills")["facets"]
+    assert facets["role"] == {"builder": 1}
+    assert facets["track"] == {"knowledge": 1, "skills": 1}
+    assert facets["status"] == {"accepted": 1}
+    assert ix.search_faceted("")["results"] == []
+
+
+def test_search_faceted_drops_proposals_for_accepted_hits(tiny_repo):
+    proposals = tiny_repo / "agents" / "knowledge-graphs" / "proposals"
+    proposals.mkdir()
+    for name, node in [
+        ("20260101-120000-beta.json", {"id": "knowledge:domain:beta", "data": {"title": "Beta"}}),
+        ("20260101-120001-beta2.json", {"id": "knowledge:domain:beta", "data": {"title": "Beta"}}),
+        ("20260101-120002-gamma.json", {"id": "knowledge:domain:gamma", "data": {"title": "Beta"}}),
+    ]:
+        (proposals / name).write_text(json.dumps(node), encoding="utf-8")
+    ix = KGIndex(repo_root=tiny_repo)
+
+    got = ix.search_faceted("beta", limit=10)
+    assert [r["id"] for r in got["results"]] == [
+        "knowledge:domain:beta", "knowledge:domain:gamma"
+    ]
+    assert got["facets"]["status"] == {"accepted": 1, "pending_proposal": 1}
+    assert got["facets"]["role"] == {"domain": 2}
+    assert got["facets"]["track"] == {"knowledge": 2}
+    assert sum(got["facets"]["status"].values()) == len(ix.search_page("beta", limit=10)["results"])
+
+
+def test_raw_node_is_read_back_from_its_graph_on_demand(tiny_repo):
+    beta = {"id": "knowledge:domain:beta", "type": "concept", "data": {"title": "Beta"}}
+    gamma = {"id": "knowledge:domain:gamma", "links": {"related": "knowledge:domain:beta"}}
+    _write_graph(tiny_repo, "domain-knowledge-graph.json", "nodes", [beta, gamma])
+    ix = KGIndex(repo_root=tiny_repo)
+    ix.rebuild()
+    s = ix.snapshot()
+    assert not hasattr(s._nodes[s._by_id["knowledge:domain:beta"]], "__dict__")
+    got = ix.get_nodes(["knowledge:domain:gamma", "knowledge:builder:alpha"])
+    assert got["knowledge:domain:gamma"]["node"] == gamma
+    assert got["knowledge:domain:gamma"]["role"] == "domain"
+
+    # Reordering the file re-uses the docs but must move their positions.
+    _write_graph(tiny_repo, "domain-knowledge-graph.json", "nodes", [{"x": 1}, gamma, beta])
+    assert ix.rebuild() == 0
+    assert ix.get_node("knowledge:domain:beta")["node"] == beta
+
+
+def test_memory_bench_compact_layout_is_smaller():
+    text = bench_memory.synthetic_graph(2000)
+    legacy, _ = bench_memory.measure(bench_memory._legacy, text, "domain-skills")
+    compact, count = bench_memory.measure(
+        bench_memory.IndexedNode.from_raw, text, "domain-skills"
+    )
+    assert count == 2000 and compact < legacy
+
+
+def test_snapshots_are_isolated_and_rebuilds_single_flight(tiny_repo):
+    ix = KGIndex(repo_root=tiny_repo, body_check_interval=0.0)
+    before = ix.snapshot()
+    beta_doc = before._by_id["knowledge:domain:beta"]
+    _write_graph(tiny_repo, "domain-knowledge-graph.json", "nodes", [
+        {"id": "knowledge:domain:gamma", "data": {"title": "Gamma beta"}},
+    ])
+    (tiny_repo / "docs" / "alpha.md").write_text("# Alpha\nokapi\n", encoding="utf-8")
+    assert ix.rebuild() == 3
+    after = ix.snapshot()
+    assert after.generation == before.generation + 1
+    # The old snapshot still answers exactly as it did before the rebuild.
+    assert before._nodes[beta_doc].id == "knowledge:domain:beta"
+    assert set(before._postings["zebra"]) == {before._by_id["knowledge:builder:alpha"]}
+    assert "okapi" not in before._postings and "zebra" not in after._postings
+
+    # A reader that finds a rebuild in flight keeps the published snapshot.
+    with ix._rebuild_lock:
+        _write_graph(tiny_repo, "domain-knowledge-graph.json", "nodes", [])
+        assert ix.rebuild(block=False) == 0
+        assert ix.snapshot() is after
+    assert ix.rebuild() == 1
+
+    # Concurrent readers during rebuilds only ever see whole snapshots.
+    errors = []
+
+    def read():
+        for _ in range(50):
+            s = ix.snapshot()
+            if set(s._by_id) not in ({"knowledge:builder:alpha"},
+                                     {"knowledge:builder:alpha", "knowledge:domain:beta"}):
+                errors.append(sorted(s._by_id))
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for t in readers:
+        t.start()
+    for i in range(20):
+        nodes = [{"id": "knowledge:domain:beta"}] if i % 2 else []
+        _write_graph(tiny_repo, "domain-knowledge-graph.json", "nodes", nodes)
+        ix.rebuild(force=i % 5 == 0)
+    for t in readers:
+        t.join()
+    assert not errors
+
+
+def test_background_rebuild_never_blocks_queries(tiny_repo):
+    ix = KGIndex(repo_root=tiny_repo, background_rebuild=True)
+    try:
+        assert ix.search("zebra")[0]["id"] == "knowledge:builder:alpha"
+        _write_graph(tiny_repo, "domain-knowledge-graph.json", "nodes", [
+            {"id": "knowledge:domain:gamma", "data": {"title": "Gamma giraffe"}},
+        ])
+        deadline = time.monotonic() + 5
+        while not ix.search("giraffe") and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert [r["id"] for r in ix.search("giraffe")] == ["knowledge:domain:gamma"]
+    finally:
+        ix.close()
+
+
+def test_watcher_events_keep_index_hot_without_query_io(tiny_repo, monkeypatch):
+    proposals = tiny_repo / "agents" / "knowledge-graphs" / "proposals"
+    proposals.mkdir()
+    ix = KGIndex(repo_root=tiny_repo)
+    # A long interval: changes are delivered by the explicit check() calls.
+    watcher = Watcher(interval=60, use_watchdog=False)
+    ix.start_watching(watcher)
+    try:
+        _write_graph(tiny_repo, "domain-knowledge-graph.json", "nodes", [
+            {"id": "knowledge:domain:gamma", "data": {"title": "Gamma giraffe"}},
+        ])
+        (tiny_repo / "docs" / "alpha.md").write_text("# Alpha\nokapi\n", encoding="utf-8")
+        node = {"id": "knowledge:domain:ocelot", "data": {"title": "Ocelot"}}
+        (proposals / "20260101-120000-ocelot.json").write_text(
+            json.dumps(node), encoding="utf-8"
+        )
+        with monkeypatch.context() as m:
+            def no_io(*args, **kwargs):
+                raise AssertionError("query path touched the filesystem")
+
+            m.setattr(kg_index, "_stat", no_io)
+            m.setattr(ProposalIndex, "refresh", no_io)
+            assert ix.search("giraffe") == []
+            assert ix.get_node("knowledge:domain:beta")["title"] == "Beta"
+
+        assert watcher.check()
+        assert [r["id"] for r in ix.search("giraffe")] == ["knowledge:domain:gamma"]
+        assert [r["id"] for r in ix.search("okapi")] == ["knowledge:builder:alpha"]
+        assert ix.search("zebra") == []
+        [hit] = ix.search("ocelot")
+        assert hit["status"] == "pending_proposal"
+        assert ix.get_node("knowledge:domain:beta") is None
+    finally:
+        ix.stop_watching()
+    # A shared watcher keeps running for its other subscribers.
+    assert watcher.running and not watcher._subscribers
+    watcher.stop()
+
+
+def test_watchdog_backend_delivers_coalesced_batches(tmp_path):
+    pytest.importorskip("watchdog")
+    batches = []
+    watcher = Watcher(settle=0.1, use_watchdog=True)
+    watcher.subscribe(batches.append)
+    watcher.watch("t", dirs=[tmp_path])
+    watcher.start()
+    try:
+        assert watcher.backend == "watchdog"
+        for i in range(5):
+            (tmp_path / f"f{i}.json").write_text("{}", encoding="utf-8")
+        deadline = time.monotonic() + 5
+        while not batches and time.monotonic() < deadline:
+            time.sleep(0.02)
+        # Reading a watched file (as subscribers do) is not a change.
+        seen = len(batches)
+        (tmp_path / "f0.json").read_bytes()
+        time.sleep(0.3)
+        assert len(batches) == seen
+    finally:
+        watcher.stop()
+    assert {tmp_path / f"f{i}.json" for i in range(5)} <= set().union(*batches)
+    assert len(batches) <= 2
+
+
+def test_watcher_logs_a_failing_subscriber_and_notifies_the_rest(tmp_path, caplog):
+    watched = tmp_path / "a.json"
+    watched.write_text("{}")
+    watcher = Watcher(use_watchdog=False)
+    watcher.watch("t", files=[watched])
+    watcher.check()
+    seen: set = set()
+
+    def broken(paths):
+        raise RuntimeError("boom")
+
+    watcher.subscribe(broken)
+    watcher.subscribe(seen.update)
+    watched.write_text('{"changed": true}')
+    with caplog.at_level("ERROR", logger="agentloom.kg.kg_watch"):
+        assert watcher.check() == {watched}
+    assert seen == {watched}
+    [record] = caplog.records
+    assert record.exc_info[0] is RuntimeError
+
+
+@pytest.mark.parametrize("use_watchdog", [True, False])
+def test_watcher_follows_a_directory_created_after_start(tmp_path, use_watchdog):
+    if use_watchdog:
+        pytest.importorskip("watchdog")
+    seen: set = set()
+    watcher = Watcher(interval=0.05, settle=0.05, use_watchdog=use_watchdog)
+    watcher.subscribe(seen.update)
+    proposals = tmp_path / "kg" / "proposals"
+    watcher.watch("t", dirs=[proposals])
+    watcher.start()
+
+    def wait_for(path):
+        deadline = time.monotonic() + 5
+        while path not in seen and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert path in seen
+        seen.clear()
+
+    try:
+        proposals.mkdir(parents=True)
+        wait_for(proposals)
+        proposal = proposals / "20260101-000000-a.json"
+        proposal.write_text("{}", encoding="utf-8")
+        wait_for(proposal)
+        proposal.write_text('{"id": "edited"}', encoding="utf-8")
+        wait_for(proposal)
+    finally:
+        watcher.stop()
+
+
+def test_cursor_pages_and_lazy_iterator_follow_score_id_order(index):
+    query = "validator tier protocol"
+    everything = list(index.search_iter(query))
+    assert len(everything) > 10
+    keys = [(-h["score"], h["id"]) for h in everything]
+    assert keys == sorted(keys)
+    assert len({h["id"] for h in everything}) == len(everything)
+
+    pages, cursor = [], None
+    while True:
+        page = index.search_page(query, limit=4, cursor=cursor)
+        pages.extend(page["results"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert pages == everything
+    # A cursor resumes the lazy iterator too, right after its hit.
+    second = index.search_page(query, limit=4)
+    rest = index.search_iter(query, cursor=second["next_cursor"])
+    assert next(rest) == everything[4]
+    with pytest.raises(ValueError):
+        index.search_page(query, cursor="not-a-cursor")
+
+
+def test_cursor_survives_index_changes_between_pages(tiny_repo):
+    nodes = [{"id": f"knowledge:domain:n{i}", "data": {"title": "okapi"}} for i in range(6)]
+    _write_graph(tiny_repo, "domain-knowledge-graph.json", "nodes", nodes)
+    ix = KGIndex(repo_root=tiny_repo)
+    first = ix.search_page("okapi", limit=3)
+    assert [h["id"] for h in first["results"]] == [n["id"] for n in nodes[:3]]
+    _write_graph(tiny_repo, "domain-knowledge-graph.json", "nodes", nodes[1:] + [
+        {"id": "knowledge:domain:a0", "data": {"title": "okapi"}},
+    ])
+    second = ix.search_page("okapi", limit=3, cursor=first["next_cursor"])
+    assert [h["id"] for h in second["results"]] == [n["id"] for n in nodes[3:]]
+    assert second["next_cursor"] is None
+
+
+def test_snippets_highlight_densest_body_cluster(tiny_repo):
+    body = "# Alpha\n" + "filler words " * 40 + "\nokapi once\n" + "padding " * 40
+    body += "\n## Habitat\nThe okapi and the zebra share a forest; okapi again.\n"
+    (tiny_repo / "docs" / "alpha.md").write_text(body, encoding="utf-8")
+    _write_graph(tiny_repo, "domain-knowledge-graph.json", "nodes", [
+        {"id": "knowledge:domain:beta", "data": {"title": "Beta", "description": "A zebra."}},
+    ])
+    ix = KGIndex(repo_root=tiny_repo)
+    [alpha, beta] = ix.search("okapi zebra", snippets=True)
+    snippet = alpha["snippet"]
+    assert snippet["field"] == "body"
+    assert "**okapi** and the **zebra** share" in snippet["highlighted"]
+    marked = [snippet["text"][a:b] for a, b in snippet["highlights"]]
+    assert marked.count("zebra") == 1 and marked.count("okapi") >= 2
+    assert len(snippet["text"]) <= SNIPPET_CHARS + 2
+    assert beta["snippet"]["highlighted"] == "A **zebra**."
+    assert "snippet" not in ix.search("okapi zebra")[0]
+    assert densest_window([(0, 5, "a"), (100, 105, "b"), (110, 115, "a")], 50) == (100, 115)